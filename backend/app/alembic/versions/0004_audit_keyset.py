@@ -0,0 +1,108 @@
+"""audit keyset pagination indexes
+
+Revision ID: 0004_audit_keyset
+Revises: 0003_multitenant_ops
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0004_audit_keyset"
+down_revision = "0003_multitenant_ops"
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def _stable_json(payload) -> str:
+    return json.dumps(payload or {}, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _audit_hash(*, company_id: str, seq: int, entity_type: str, entity_id: str, action: str, actor_user_id: str | None, created_at: datetime, payload, prev_hash: str | None) -> str:
+    # Chain hash as of 0003_multitenant_ops (hash_version 1).
+    base = "|".join(
+        [
+            company_id,
+            str(seq),
+            entity_type,
+            entity_id,
+            action,
+            actor_user_id or "",
+            created_at.astimezone(timezone.utc).isoformat(),
+            _stable_json(payload),
+            prev_hash or "",
+        ]
+    )
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def _rechain(conn, company_id: str) -> None:
+    """Renumber a company chain 1..n in its current order and recompute prev_hash/hash."""
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, entity_type, entity_id, action, actor_user_id, payload, created_at "
+            "FROM audit_events WHERE company_id = :cid ORDER BY seq ASC, created_at ASC, id ASC"
+        )
+        .bindparams(cid=company_id)
+        .columns(created_at=sa.DateTime(timezone=True))
+    ).mappings().all()
+
+    prev = None
+    for seq, r in enumerate(rows, start=1):
+        created_at = r["created_at"]
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        h = _audit_hash(
+            company_id=company_id,
+            seq=seq,
+            entity_type=r["entity_type"],
+            entity_id=r["entity_id"],
+            action=r["action"],
+            actor_user_id=r["actor_user_id"],
+            created_at=created_at,
+            payload=r["payload"],
+            prev_hash=prev,
+        )
+        conn.execute(
+            sa.text("UPDATE audit_events SET seq=:seq, prev_hash=:prev, hash=:hash WHERE id=:id")
+            .bindparams(seq=seq, prev=prev, hash=h, id=r["id"])
+        )
+        prev = h
+
+
+def upgrade() -> None:
+    # seq is unique inside a company chain; the index doubles as the keyset cursor. Chains
+    # appended concurrently before appends were serialized can hold duplicate seqs: those
+    # chains are renumbered and re-hashed first (as 0003 built them), so the index is unique.
+    conn = op.get_bind()
+    duplicated = conn.execute(
+        sa.text("SELECT DISTINCT company_id FROM audit_events GROUP BY company_id, seq HAVING COUNT(*) > 1")
+    ).scalars().all()
+    for company_id in duplicated:
+        logger.warning("audit_events: company %s has duplicate seq values, renumbering and re-hashing its chain", company_id)
+        _rechain(conn, company_id)
+
+    op.create_index("ux_audit_company_seq", "audit_events", ["company_id", "seq"], unique=True)
+    op.create_index("ix_audit_company_entity_seq", "audit_events", ["company_id", "entity_type", "entity_id", "seq"], unique=False)
+    op.create_index("ix_audit_company_action_seq", "audit_events", ["company_id", "action", "seq"], unique=False)
+    op.create_index("ix_audit_company_actor_seq", "audit_events", ["company_id", "actor_user_id", "seq"], unique=False)
+    op.create_index("ix_audit_company_created_at", "audit_events", ["company_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_audit_company_created_at", table_name="audit_events")
+    op.drop_index("ix_audit_company_actor_seq", table_name="audit_events")
+    op.drop_index("ix_audit_company_action_seq", table_name="audit_events")
+    op.drop_index("ix_audit_company_entity_seq", table_name="audit_events")
+    op.drop_index("ux_audit_company_seq", table_name="audit_events")
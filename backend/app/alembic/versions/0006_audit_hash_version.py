@@ -0,0 +1,27 @@
+"""audit hash version
+
+Revision ID: 0006_audit_hash_version
+Revises: 0005_audit_outbox
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0006_audit_hash_version"
+down_revision = "0005_audit_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows were hashed with the v1 algorithm and keep verifying with it.
+    op.add_column("audit_events", sa.Column("hash_version", sa.Integer(), nullable=False, server_default=sa.text("1")))
+
+
+def downgrade() -> None:
+    op.drop_column("audit_events", "hash_version")
@@ -0,0 +1,48 @@
+"""vehicle live state
+
+Revision ID: 0007_vehicle_live_state
+Revises: 0006_audit_hash_version
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0007_vehicle_live_state"
+down_revision = "0006_audit_hash_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("vehicles", sa.Column("last_lat", sa.Float(), nullable=True))
+    op.add_column("vehicles", sa.Column("last_lon", sa.Float(), nullable=True))
+    op.add_column("vehicles", sa.Column("last_speed_kph", sa.Float(), nullable=True))
+    op.add_column("vehicles", sa.Column("last_heading", sa.Float(), nullable=True))
+    op.add_column("vehicles", sa.Column("state_version", sa.Integer(), nullable=False, server_default=sa.text("0")))
+
+    # Seed the last position from the position history so snapshots start populated.
+    op.execute(
+        """
+        UPDATE vehicles v
+        SET last_lat = p.lat, last_lon = p.lon, last_speed_kph = p.speed_kph, last_heading = p.heading
+        FROM (
+            SELECT DISTINCT ON (vehicle_id) vehicle_id, lat, lon, speed_kph, heading
+            FROM vehicle_positions
+            ORDER BY vehicle_id, recorded_at DESC
+        ) p
+        WHERE p.vehicle_id = v.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("vehicles", "state_version")
+    op.drop_column("vehicles", "last_heading")
+    op.drop_column("vehicles", "last_speed_kph")
+    op.drop_column("vehicles", "last_lon")
+    op.drop_column("vehicles", "last_lat")
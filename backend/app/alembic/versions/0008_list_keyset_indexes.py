@@ -0,0 +1,40 @@
+"""keyset pagination indexes for list endpoints
+
+Revision ID: 0008_list_keyset_indexes
+Revises: 0007_vehicle_live_state
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "0008_list_keyset_indexes"
+down_revision = "0007_vehicle_live_state"
+branch_labels = None
+depends_on = None
+
+# (index, table, columns): lists are ordered by (created_at, id) desc inside a company.
+_INDEXES = [
+    ("ix_vehicles_company_created_id", "vehicles", ["company_id", "created_at", "id"]),
+    ("ix_orders_company_created_id", "orders", ["company_id", "created_at", "id"]),
+    ("ix_alerts_company_created_id", "alerts", ["company_id", "created_at", "id"]),
+    ("ix_users_company_created_id", "users", ["company_id", "created_at", "id"]),
+    ("ix_incidents_company_created_id", "incidents", ["company_id", "created_at", "id"]),
+    ("ix_geozones_company_created_id", "geozones", ["company_id", "created_at", "id"]),
+    ("ix_geozone_events_company_occurred_id", "geozone_events", ["company_id", "occurred_at", "id"]),
+    ("ix_notifications_company_user_created_id", "notifications", ["company_id", "user_id", "created_at", "id"]),
+    ("ix_telemetry_api_keys_company_created_id", "telemetry_api_keys", ["company_id", "created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in _INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
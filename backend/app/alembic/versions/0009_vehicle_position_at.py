@@ -0,0 +1,40 @@
+"""vehicle last position timestamp
+
+Revision ID: 0009_vehicle_position_at
+Revises: 0008_list_keyset_indexes
+Create Date: 2026-10-19
+
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0009_vehicle_position_at"
+down_revision = "0008_list_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("vehicles", sa.Column("last_position_at", sa.DateTime(timezone=True), nullable=True))
+
+    # recorded_at of the point last_lat/last_lon were seeded from (0007_vehicle_live_state).
+    op.execute(
+        """
+        UPDATE vehicles v
+        SET last_position_at = p.recorded_at
+        FROM (
+            SELECT vehicle_id, MAX(recorded_at) AS recorded_at
+            FROM vehicle_positions
+            GROUP BY vehicle_id
+        ) p
+        WHERE p.vehicle_id = v.id AND v.last_lat IS NOT NULL
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("vehicles", "last_position_at")
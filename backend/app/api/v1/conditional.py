@@ -0,0 +1,55 @@
+import hashlib
+import logging
+
+from fastapi import Depends, HTTPException, Request, Response
+
+from app.api.v1.deps import get_current_user
+from app.models.user import User
+from app.services.change_versions import change_versions, track
+from app.services.redis_client import redis_is_shared
+
+logger = logging.getLogger(__name__)
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    # Weak comparison (RFC 9110 13.1.2).
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def conditional(*collections: str):
+    """Dependency giving a list endpoint an ETag and answering If-None-Match with 304.
+
+    The ETag is derived from the tenant's change versions of `collections` (tables the
+    response reads, bumped after every commit touching them), the user and the query string,
+    so a match is answered before the list query runs. Without a version (Redis down or the
+    in-memory fallback, a replica possibly lagging) the list is served without an ETag.
+
+    The versions are left in `request.state.change_versions` for the handler (see
+    Projection.render_cached), so the body and its ETag come from the same read.
+    """
+    track(*collections)
+
+    def check_etag(request: Request, response: Response, user: User = Depends(get_current_user)) -> None:
+        if not redis_is_shared():
+            # Each worker would count its own versions and could 304 another's change.
+            return
+        try:
+            versions = change_versions(user.company_id, collections)
+        except Exception:
+            logger.exception("Change versions unavailable, serving without ETag")
+            return
+        if versions is None:
+            return
+        request.state.change_versions = versions
+        # Drivers see their own subset, so the user is part of the tag.
+        key = f"{user.id}|{request.url.query}|{'.'.join(map(str, versions))}"
+        etag = f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return check_etag
@@ -1,18 +1,94 @@
-from fastapi import Depends, HTTPException, status
+import asyncio
+
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
-from sqlalchemy.orm import Session
 
 from app.core.settings import settings
-from app.db.session import get_db
+from app.db.session import AsyncReadSessionLocal, AsyncSessionLocal, ReadSessionLocal, SessionLocal
 from app.models.user import User
 from app.models.enums import UserRole
+from app.services.auth_tokens import stateless_permissions, stateless_versions, version_cache
 from app.services.permissions import get_effective_permissions, require_all
+from app.services.read_routing import set_request_user, wrote_recently
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_prefix}/auth/login")
 
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+class TokenUser:
+    """User as described by a verified stateless token.
+
+    id, company_id and role come from the token; any other attribute loads the row on first access.
+    That load is a sync query, refused on the event loop: async code awaits load() first.
+    """
+
+    def __init__(self, claims: dict) -> None:
+        self.id = claims["sub"]
+        self.company_id = claims["company_id"]
+        self.role = UserRole(claims["role"])
+        self.is_active = True
+        self._row: User | None = None
+
+    def __getattr__(self, name: str):
+        # Only reached for attributes not set in __init__.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if self._row is None:
+            if _on_event_loop():
+                raise RuntimeError(f"TokenUser.{name} needs the user row: await load() in async code")
+            with SessionLocal() as db:
+                self._set_row(db.get(User, self.id))
+        return getattr(self._row, name)
+
+    async def load(self) -> None:
+        if self._row is None:
+            async with AsyncSessionLocal() as db:
+                self._set_row(await db.get(User, self.id))
+
+    def _set_row(self, row: User | None) -> None:
+        if row is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User inactive")
+        self._row = row
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+def _load_permissions(user: User | TokenUser) -> set[str]:
+    with SessionLocal() as db:
+        return get_effective_permissions(db, user)
+
+
+class AuthContext:
+    """Authenticated principal of one request: token decoded, user and permissions loaded once."""
+
+    __slots__ = ("user", "claims", "_permissions")
+
+    def __init__(self, user: User | TokenUser, claims: dict, permissions: set[str] | None = None) -> None:
+        self.user = user
+        self.claims = claims
+        self._permissions = permissions
+
+    async def permissions(self) -> set[str]:
+        # Cached sets (and stateless tokens) need no query; a miss loads on the threadpool.
+        if self._permissions is None:
+            self._permissions = await run_in_threadpool(_load_permissions, self.user)
+        return self._permissions
+
+
+async def get_auth_context(request: Request, token: str = Depends(oauth2_scheme)) -> AuthContext:
+    """Async, so neither the user lookup nor the checks stacked on it take a threadpool slot."""
+    # Stored on the request so every dependency path (cached or not) shares one decode and one lookup.
+    ctx = getattr(request.state, "auth", None)
+    if ctx is not None:
+        return ctx
+
     try:
         payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_alg])
     except Exception:
@@ -22,19 +98,60 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
     token_company_id = payload.get("company_id")
     if not user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    # Writes committed while handling this request start the user's read-your-writes window.
+    set_request_user(user_id)
 
-    user = db.get(User, user_id)
+    # Stateless fast path for reads: no user lookup, no permission queries while the token's
+    # auth versions are current. Writes always check the user row. Versions checked within their
+    # TTL are compared in memory; reading them from Redis goes to the threadpool.
+    if request.method == "GET" and settings.jwt_stateless and token_company_id and "pb" in payload:
+        versions = version_cache.cached(user_id)
+        if versions is None:
+            versions = await run_in_threadpool(stateless_versions, user_id)
+        perms = stateless_permissions(payload, versions) if versions is not None else None
+        if perms is not None:
+            ctx = AuthContext(TokenUser(payload), payload, perms)
+            request.state.auth = ctx
+            return ctx
+
+    async with AsyncSessionLocal() as db:
+        user = await db.get(User, user_id)
     if not user or not user.is_active:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User inactive")
 
     # Token must match tenant to avoid confused-deputy scenarios.
     if not token_company_id or token_company_id != user.company_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    return user
+
+    ctx = AuthContext(user, payload)
+    request.state.auth = ctx
+    return ctx
+
+
+def get_read_db(ctx: AuthContext = Depends(get_auth_context)):
+    """Session for read-only endpoints: a replica when configured, unless the user just wrote."""
+    db = ReadSessionLocal()
+    try:
+        if db.uses_replica and wrote_recently(ctx.user.id):
+            db.pin_primary()
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(ctx: AuthContext = Depends(get_auth_context)):
+    async with AsyncReadSessionLocal() as db:
+        if db.sync_session.uses_replica and await run_in_threadpool(wrote_recently, ctx.user.id):
+            db.sync_session.pin_primary()
+        yield db
+
+
+async def get_current_user(ctx: AuthContext = Depends(get_auth_context)) -> User:
+    return ctx.user
 
 
 def require_roles(*roles: UserRole):
-    def checker(user: User = Depends(get_current_user)) -> User:
+    async def checker(user: User = Depends(get_current_user)) -> User:
         if UserRole(user.role) not in roles:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
         return user
@@ -43,14 +160,13 @@ def require_roles(*roles: UserRole):
 
 
 def require_permissions(*permissions: str):
-    def checker(db: Session = Depends(get_db), user: User = Depends(get_current_user)) -> User:
-        effective = get_effective_permissions(db, user)
-        if not require_all(permissions, effective):
+    async def checker(ctx: AuthContext = Depends(get_auth_context)) -> User:
+        if not require_all(permissions, await ctx.permissions()):
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Forbidden")
-        return user
+        return ctx.user
 
     return checker
 
 
-def get_company_id(user: User = Depends(get_current_user)) -> str:
+async def get_company_id(user: User = Depends(get_current_user)) -> str:
     return user.company_id
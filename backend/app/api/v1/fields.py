@@ -0,0 +1,204 @@
+from operator import itemgetter
+from typing import Any, Callable
+
+from fastapi import HTTPException, Query, Request, Response
+from pydantic import BaseModel, TypeAdapter, create_model
+from sqlalchemy import select
+
+from app.api.v1.pagination import NEXT_CURSOR_HEADER, Page, encode_cursor, keyset, paginate
+from app.core.compression import compress, negotiate
+from app.core.serialization import dumps_bytes
+from app.core.settings import settings
+from app.services.cache import tenant_cache
+
+
+def render_json(response: Response, items: list) -> Response:
+    """JSON response of plain rows; keeps headers set on `response` (X-Next-Cursor)."""
+    return Response(content=dumps_bytes(items), media_type="application/json", headers=dict(response.headers))
+
+
+class Embedded:
+    """Nested object of a response loaded through an outer join, e.g. vehicle -> driver."""
+
+    def __init__(self, target, onclause, schema: type[BaseModel]) -> None:
+        self.target = target
+        self.onclause = onclause
+        self.columns = {name: getattr(target, name) for name in schema.model_fields}
+
+
+class Projection:
+    """Fast path of a list endpoint: a column-level select rendered straight to JSON.
+
+    Rows are turned into dicts of the schema's fields and encoded with orjson; no ORM entities
+    are hydrated and the schema only validates them in debug mode. `fields=` (sparse fieldsets)
+    narrows the select, joins only the requested embedded objects, and gets a response model
+    with just those fields.
+    """
+
+    def __init__(
+        self,
+        model,
+        schema: type[BaseModel],
+        embedded: dict[str, Embedded] | None = None,
+        order_by: str = "created_at",
+    ) -> None:
+        self.model = model
+        self.schema = schema
+        self.embedded = embedded or {}
+        self.columns = {name: getattr(model, name) for name in schema.model_fields if name not in self.embedded}
+        self.columns.setdefault(order_by, getattr(model, order_by))
+        self.order_by = order_by
+        self.all_fields = tuple(schema.model_fields)
+        # Response order follows the full schema.
+        self._order = {name: i for i, name in enumerate(schema.model_fields)}
+        self._adapters: dict[tuple[str, ...], TypeAdapter] = {}
+        self._layouts: dict[tuple[str, ...], _Layout] = {}
+
+    def parse(self, raw: str | None) -> tuple[str, ...]:
+        if not raw:
+            return self.all_fields
+        names = {part.strip() for part in raw.split(",") if part.strip()}
+        unknown = names - self._order.keys()
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+        return tuple(sorted(names | {"id"}, key=self._order.__getitem__))
+
+    def dependency(self):
+        allowed = ", ".join(self.all_fields)
+
+        def parse_fields(fields: str | None = Query(None, description=f"Comma separated subset of: {allowed}")):
+            return self.parse(fields)
+
+        return parse_fields
+
+    def _layout(self, fields: tuple[str, ...]) -> "_Layout":
+        layout = self._layouts.get(fields)
+        if layout is None:
+            layout = self._layouts[fields] = _Layout(self, fields)
+        return layout
+
+    def statement(self, fields: tuple[str, ...] | None = None):
+        layout = self._layout(fields or self.all_fields)
+        stmt = select(*(self.columns[name] for name in layout.columns)).select_from(self.model)
+        for name, _ in layout.nested:
+            emb = self.embedded[name]
+            stmt = stmt.add_columns(*emb.columns.values()).outerjoin(emb.target, emb.onclause)
+        return stmt
+
+    def select_page(self, page: Page, fields: tuple[str, ...] | None, *criteria):
+        stmt = self.statement(fields).where(*criteria)
+        return keyset(stmt, page, getattr(self.model, self.order_by), self.model.id)
+
+    def rows(self, rows, fields: tuple[str, ...]) -> list[dict[str, Any]]:
+        """Row tuples of `statement(fields)` as response dicts."""
+        layout = self._layout(fields)
+        plain, start = layout.plain, len(layout.columns)
+        out = []
+        for row in rows:
+            item = dict(zip(plain, row))
+            offset = start
+            for name, keys in layout.nested:
+                values = row[offset : offset + len(keys)]
+                offset += len(keys)
+                # Outer join without a match: the embedded object is null.
+                item[name] = dict(zip(keys, values)) if values[keys.index("id")] is not None else None
+            out.append(item)
+        return out
+
+    def adapter(self, fields: tuple[str, ...]) -> TypeAdapter:
+        adapter = self._adapters.get(fields)
+        if adapter is None:
+            if fields == self.all_fields:
+                model = self.schema
+            else:
+                model = create_model(
+                    f"{self.schema.__name__}Fields",
+                    **{name: (self.schema.model_fields[name].annotation, self.schema.model_fields[name]) for name in fields},
+                )
+            adapter = self._adapters[fields] = TypeAdapter(list[model])
+        return adapter
+
+    def render(self, response: Response, rows, fields: tuple[str, ...] | None = None) -> Response:
+        fields = fields or self.all_fields
+        items = self.rows(rows, fields)
+        if settings.debug:
+            # Catches drift between the select and the response schema during development.
+            self.adapter(fields).validate_python(items)
+        return render_json(response, items)
+
+    def page_items(self, rows, page: Page, fields: tuple[str, ...] | None = None) -> tuple[list, str | None]:
+        """Rows of `select_page` as (items, next cursor), e.g. to cache a page."""
+        fields = fields or self.all_fields
+        next_cursor = None
+        if len(rows) > page.limit:
+            rows = rows[: page.limit]
+            next_cursor = encode_cursor(*self._layout(fields).page_key(rows[-1]))
+        return self.rows(rows, fields), next_cursor
+
+    def render_page(self, response: Response, rows, page: Page, fields: tuple[str, ...] | None = None) -> Response:
+        """Rows of `select_page` as the page response (next cursor header included)."""
+        fields = fields or self.all_fields
+        return self.render(response, paginate(response, rows, page, self._layout(fields).page_key), fields)
+
+    def render_cached(
+        self,
+        request: Request,
+        response: Response,
+        company_id: str,
+        entity_set: str,
+        page: Page,
+        load_rows: Callable[[], list],
+    ) -> Response:
+        """Page of a company-wide list served through the tenant cache (app.services.cache).
+
+        The page's items are cached like any entity set entry; on top of that each worker keeps
+        the encoded body once per content encoding, so repeated reads skip both JSON encoding
+        and compression. `load_rows` runs `select_page` on a miss.
+
+        Entries are keyed by the change versions the route's `conditional` dependency read, so a
+        body always belongs to the ETag sent with it; a commit moves the versions, and with them
+        the key, before any worker sees the cache invalidation. Without versions the cache is
+        bypassed.
+        """
+        versions = getattr(request.state, "change_versions", None)
+        if versions is None:
+            return self.render_page(response, load_rows(), page)
+        encoding = negotiate(request.headers.get("accept-encoding")) if settings.compression_enabled else None
+        key = f"list:{'.'.join(map(str, versions))}:{page.key}"
+
+        def load_items():
+            return self.page_items(load_rows(), page)
+
+        def load_body():
+            items, next_cursor = tenant_cache.get_or_load(company_id, entity_set, key, load_items)
+            if settings.debug:
+                self.adapter(self.all_fields).validate_python(items)
+            body = dumps_bytes(items)
+            if encoding is None or len(body) < settings.compression_min_size:
+                return body, None, next_cursor
+            return compress(body, encoding), encoding, next_cursor
+
+        body, content_encoding, next_cursor = tenant_cache.get_or_load(
+            company_id, entity_set, f"{key}:{encoding}", load_body, shared=False
+        )
+        headers = dict(response.headers)
+        if next_cursor:
+            headers[NEXT_CURSOR_HEADER] = next_cursor
+        if content_encoding:
+            # Already compressed: CompressionMiddleware passes it through untouched.
+            headers["Content-Encoding"] = content_encoding
+            headers["Vary"] = "Accept-Encoding"
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+class _Layout:
+    """Column order of one field set: plain fields, the ordering column, then embedded objects."""
+
+    def __init__(self, projection: Projection, fields: tuple[str, ...]) -> None:
+        self.plain = [name for name in fields if name not in projection.embedded]
+        self.columns = list(self.plain)
+        if projection.order_by not in self.columns:
+            self.columns.append(projection.order_by)
+        self.nested = [(name, list(projection.embedded[name].columns)) for name in fields if name in projection.embedded]
+        # Keyset pagination reads the cursor from every row (app.api.v1.pagination).
+        self.page_key = itemgetter(self.columns.index(projection.order_by), self.columns.index("id"))
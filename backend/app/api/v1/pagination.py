@@ -0,0 +1,76 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import DateTime, bindparam, func, tuple_
+from sqlalchemy.engine import make_url
+
+from app.core.settings import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# SQLite (dev) keeps timestamps as text in mixed formats (server defaults carry no fractional
+# seconds), so bound datetimes don't compare reliably there; compare as julian days instead.
+_SQLITE = make_url(settings.database_url).get_backend_name() == "sqlite"
+
+
+def _sortable(expr, col_type):
+    return func.julianday(expr) if _SQLITE and isinstance(col_type, DateTime) else expr
+
+
+def encode_cursor(at: datetime, row_id: str) -> str:
+    raw = json.dumps([at.isoformat(), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        at, row_id = json.loads(raw)
+        return datetime.fromisoformat(at), str(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+class Page:
+    """`limit` and `cursor` of a list endpoint; newest first, keyed on (created_at, id).
+
+    The cursor is opaque to clients: pass back the X-Next-Cursor header of the previous
+    page. No header means the last page.
+    """
+
+    def __init__(
+        self,
+        limit: int | None = Query(None, ge=1, le=settings.list_page_size_max),
+        cursor: str | None = Query(None, description="X-Next-Cursor header of the previous page"),
+    ):
+        self.limit = limit or settings.list_page_size
+        self.after = decode_cursor(cursor) if cursor else None
+        # Identifies the page among cached pages of the same list.
+        self.key = f"{self.limit}:{cursor or ''}"
+
+
+def keyset(stmt, page: Page, order_col, id_col):
+    """Apply the page to a Select or ORM Query ordered by (order_col, id_col) desc."""
+    order_key = _sortable(order_col, order_col.type)
+    if page.after is not None:
+        at, row_id = page.after
+        after = _sortable(bindparam(None, at, type_=order_col.type), order_col.type)
+        stmt = stmt.where(tuple_(order_key, id_col) < tuple_(after, row_id))
+    # One extra row tells whether another page follows.
+    return stmt.order_by(order_key.desc(), id_col.desc()).limit(page.limit + 1)
+
+
+def paginate(
+    response: Response,
+    rows: list,
+    page: Page,
+    key: Callable[[Any], tuple[datetime, str]] = lambda row: (row.created_at, row.id),
+) -> list:
+    """Trim the extra row of `keyset` and set the next cursor header."""
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(rows[-1]))
+    return rows
@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from app.api.v1.routes import auth, vehicles, alerts, audit, orders, users
 from app.api.v1.routes import permissions, telemetry, geozones, notifications, incidents, ws
+from app.api.v1.routes import metrics, sse
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
@@ -15,4 +16,6 @@ api_router.include_router(telemetry.router, prefix="/telemetry", tags=["telemetr
 api_router.include_router(geozones.router, prefix="/geozones", tags=["geozones"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 api_router.include_router(incidents.router, prefix="/incidents", tags=["incidents"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 api_router.include_router(ws.router, tags=["ws"])
+api_router.include_router(sse.router, prefix="/events", tags=["events"])
@@ -1,10 +1,12 @@
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user, require_permissions
+from app.api.v1.deps import get_current_user, get_read_db, require_permissions
+from app.api.v1.fields import Projection
+from app.api.v1.pagination import Page
 from app.db.session import get_db
 from app.models.alert import Alert
 from app.models.driver import DriverProfile
@@ -15,6 +17,7 @@ from app.models.vehicle import Vehicle
 from app.schemas.alert import AlertCreate, AlertOut
 from app.services.audit import write_audit
 from app.services.events import publish_event
+from app.services.reference_data import driver_vehicle_ids
 
 router = APIRouter()
 
@@ -59,38 +62,51 @@ def create_alert(vehicle_id: str, payload: AlertCreate, db: Session = Depends(ge
     return a
 
 
+_PROJECTION = Projection(Alert, AlertOut)
+_fields = _PROJECTION.dependency()
+
+
+def _page(response: Response, page: Page, fields: tuple[str, ...], db: Session, criteria: list):
+    rows = db.execute(_PROJECTION.select_page(page, fields, *criteria)).all()
+    return _PROJECTION.render_page(response, rows, page, fields)
+
+
 @router.get("", response_model=list[AlertOut], dependencies=[Depends(require_permissions("alerts.read"))])
-def list_alerts(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    q = db.query(Alert).filter(Alert.company_id == user.company_id)
+def list_alerts(
+    response: Response,
+    page: Page = Depends(),
+    fields: tuple[str, ...] = Depends(_fields),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    criteria = [Alert.company_id == user.company_id]
     if UserRole(user.role) == UserRole.driver:
-        dp = db.query(DriverProfile).filter(DriverProfile.user_id == user.id, DriverProfile.company_id == user.company_id).first()
-        if not dp:
-            return []
-        vehicle_ids = [v.id for v in db.query(Vehicle.id).filter(Vehicle.company_id == user.company_id, Vehicle.driver_profile_id == dp.id).all()]
+        vehicle_ids = driver_vehicle_ids(db, user.company_id, user.id)
         if not vehicle_ids:
             return []
-        q = q.filter(Alert.vehicle_id.in_(vehicle_ids))
-    return q.order_by(Alert.created_at.desc()).all()
+        criteria.append(Alert.vehicle_id.in_(vehicle_ids))
+    return _page(response, page, fields, db, criteria)
 
 
 @router.get("/active", response_model=list[AlertOut], dependencies=[Depends(require_permissions("alerts.read"))])
-def list_active_alerts_for_driver(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
+def list_active_alerts_for_driver(
+    response: Response,
+    page: Page = Depends(),
+    fields: tuple[str, ...] = Depends(_fields),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
     if UserRole(user.role) != UserRole.driver:
         raise HTTPException(status_code=403, detail="Only drivers can access this endpoint")
-    dp = db.query(DriverProfile).filter(DriverProfile.user_id == user.id, DriverProfile.company_id == user.company_id).first()
-    if not dp:
-        return []
-    vehicle_ids = [v.id for v in db.query(Vehicle.id).filter(Vehicle.company_id == user.company_id, Vehicle.driver_profile_id == dp.id).all()]
+    vehicle_ids = driver_vehicle_ids(db, user.company_id, user.id)
     if not vehicle_ids:
         return []
-    return (
-        db.query(Alert)
-        .filter(Alert.company_id == user.company_id)
-        .filter(Alert.vehicle_id.in_(vehicle_ids))
-        .filter(Alert.status.in_([AlertStatus.created, AlertStatus.delivered]))
-        .order_by(Alert.created_at.desc())
-        .all()
-    )
+    criteria = [
+        Alert.company_id == user.company_id,
+        Alert.vehicle_id.in_(vehicle_ids),
+        Alert.status.in_([AlertStatus.created, AlertStatus.delivered]),
+    ]
+    return _page(response, page, fields, db, criteria)
 
 
 @router.post("/{alert_id}/ack", response_model=AlertOut, dependencies=[Depends(require_permissions("alerts.ack"))])
@@ -1,40 +1,155 @@
-from fastapi import APIRouter, Depends
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Iterator, Literal
+
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user, require_permissions
-from app.db.session import get_db
+from app.api.v1.deps import get_async_read_db, get_current_user, require_permissions
+from app.api.v1.fields import render_json
+from app.db.session import ReadSessionLocal, get_db
 from app.models.audit import AuditEvent
 from app.models.user import User
 from app.services.audit_chain import verify_audit_chain
 
 router = APIRouter()
 
+_AUDIT_COLUMNS = (
+    AuditEvent.id,
+    AuditEvent.company_id,
+    AuditEvent.seq,
+    AuditEvent.hash,
+    AuditEvent.prev_hash,
+    AuditEvent.hash_version,
+    AuditEvent.entity_type,
+    AuditEvent.entity_id,
+    AuditEvent.action,
+    AuditEvent.actor_user_id,
+    AuditEvent.payload,
+    AuditEvent.created_at,
+)
+_CSV_HEADER = [c.key for c in _AUDIT_COLUMNS]
+_EXPORT_BATCH = 500
+
+
+class AuditFilters:
+    """Query filters shared by the list and export endpoints."""
+
+    def __init__(
+        self,
+        entity_type: str | None = None,
+        entity_id: str | None = None,
+        action: str | None = None,
+        actor_user_id: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ):
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.action = action
+        self.actor_user_id = actor_user_id
+        self.since = since
+        self.until = until
+
+    def statement(self, company_id: str):
+        stmt = select(*_AUDIT_COLUMNS).where(AuditEvent.company_id == company_id)
+        if self.entity_type:
+            stmt = stmt.where(AuditEvent.entity_type == self.entity_type)
+        if self.entity_id:
+            stmt = stmt.where(AuditEvent.entity_id == self.entity_id)
+        if self.action:
+            stmt = stmt.where(AuditEvent.action == self.action)
+        if self.actor_user_id:
+            stmt = stmt.where(AuditEvent.actor_user_id == self.actor_user_id)
+        if self.since:
+            stmt = stmt.where(AuditEvent.created_at >= self.since)
+        if self.until:
+            stmt = stmt.where(AuditEvent.created_at < self.until)
+        return stmt
+
+
+def _page_statement(company_id: str, filters: AuditFilters, cursor: int | None, limit: int):
+    # Newest first; the cursor is the last seen seq, so pages stay stable while new events are appended.
+    stmt = filters.statement(company_id)
+    if cursor is not None:
+        stmt = stmt.where(AuditEvent.seq < cursor)
+    return stmt.order_by(AuditEvent.seq.desc()).limit(limit)
+
+
+def _page(response: Response, rows, limit: int) -> Response:
+    if len(rows) == limit:
+        response.headers["X-Next-Cursor"] = str(rows[-1].seq)
+    return render_json(response, [r._asdict() for r in rows])
+
 
 @router.get("", dependencies=[Depends(require_permissions("audit.read"))])
-def list_audit(db: Session = Depends(get_db), limit: int = 200, user: User = Depends(get_current_user)):
-    rows = (
-        db.query(AuditEvent)
-        .filter(AuditEvent.company_id == user.company_id)
-        .order_by(AuditEvent.created_at.desc())
-        .limit(limit)
-        .all()
+async def list_audit(
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    limit: int = Query(200, ge=1, le=1000),
+    cursor: int | None = Query(None, description="seq of the last row from the previous page"),
+    filters: AuditFilters = Depends(),
+    user: User = Depends(get_current_user),
+):
+    rows = (await db.execute(_page_statement(user.company_id, filters, cursor, limit))).all()
+    return _page(response, rows, limit)
+
+
+def _stream_rows(company_id: str, filters: AuditFilters) -> Iterator:
+    # Own (replica) session: the request-scoped one is closed before the body is streamed.
+    db = ReadSessionLocal()
+    try:
+        stmt = filters.statement(company_id).order_by(AuditEvent.seq.asc())
+        result = db.execute(stmt, execution_options={"yield_per": _EXPORT_BATCH})
+        for partition in result.mappings().partitions():
+            yield partition
+    finally:
+        db.close()
+
+
+def _ndjson_chunks(company_id: str, filters: AuditFilters) -> Iterator[str]:
+    for partition in _stream_rows(company_id, filters):
+        yield "".join(json.dumps(dict(r), ensure_ascii=False, default=str) + "\n" for r in partition)
+
+
+def _csv_chunks(company_id: str, filters: AuditFilters) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(_CSV_HEADER)
+    for partition in _stream_rows(company_id, filters):
+        for r in partition:
+            writer.writerow(
+                [json.dumps(r[k], ensure_ascii=False, default=str) if k == "payload" else r[k] for k in _CSV_HEADER]
+            )
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+    if buf.tell():
+        yield buf.getvalue()
+
+
+@router.get("/export", dependencies=[Depends(require_permissions("audit.read"))])
+def export_audit(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    filters: AuditFilters = Depends(),
+    user: User = Depends(get_current_user),
+):
+    if format == "csv":
+        return StreamingResponse(
+            _csv_chunks(user.company_id, filters),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="audit.csv"'},
+        )
+    return StreamingResponse(
+        _ndjson_chunks(user.company_id, filters),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="audit.ndjson"'},
     )
-    return [
-        {
-            "id": r.id,
-            "company_id": r.company_id,
-            "seq": r.seq,
-            "hash": r.hash,
-            "prev_hash": r.prev_hash,
-            "entity_type": r.entity_type,
-            "entity_id": r.entity_id,
-            "action": r.action,
-            "actor_user_id": r.actor_user_id,
-            "payload": r.payload,
-            "created_at": r.created_at,
-        }
-        for r in rows
-    ]
 
 
 @router.get("/verify", dependencies=[Depends(require_permissions("audit.read"))])
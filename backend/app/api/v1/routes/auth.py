@@ -1,9 +1,16 @@
 import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.core.security import create_access_token_v2, hash_password, verify_password
+from app.core.security import (
+    create_access_token_v2,
+    hash_password,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
 from app.core.utils import slugify
 from app.db.session import get_db
 from app.models.company import Company
@@ -11,16 +18,25 @@ from app.models.enums import UserRole
 from app.models.user import User
 from app.schemas.auth import LoginRequest, RegisterRequest, MeResponse, TokenResponse
 from app.api.v1.deps import get_current_user
+from app.services.auth_tokens import stateless_claims, stateless_enabled
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=MeResponse)
-def register(payload: RegisterRequest, db: Session = Depends(get_db)):
+async def register(payload: RegisterRequest, db: Session = Depends(get_db)):
     """Self-serve регистрация: создаёт компанию + первого owner.
 
     Для production обычно закрывают за invite/checkout, но для MVP это удобный вход.
     """
+    # bcrypt runs in the password pool; the DB parts stay sync functions in the threadpool.
+    # Conflicts are checked first, so rejected requests never queue for a hash.
+    company_name, company_slug = await run_in_threadpool(_check_register, payload, db)
+    password_hash = await hash_password_async(payload.password)
+    return await run_in_threadpool(_register, payload, db, company_name, company_slug, password_hash)
+
+
+def _check_register(payload: RegisterRequest, db: Session) -> tuple[str, str]:
     # Пользователь по email должен быть уникальным.
     existing_user = db.query(User).filter(User.email == payload.email).first()
     if existing_user:
@@ -31,7 +47,10 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
     exists_company = db.query(Company).filter(Company.slug == company_slug).first()
     if exists_company:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Company slug already exists")
+    return company_name, company_slug
+
 
+def _register(payload: RegisterRequest, db: Session, company_name: str, company_slug: str, password_hash: str) -> MeResponse:
     c = Company(id=str(uuid.uuid4()), name=company_name, slug=company_slug)
     db.add(c)
 
@@ -40,7 +59,7 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
         id=str(uuid.uuid4()),
         company_id=c.id,
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
         role=UserRole.owner,
         is_active=True
     )
@@ -51,11 +70,17 @@ def register(payload: RegisterRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login(payload: LoginRequest, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == payload.email).first())
+    if not user or not await verify_password_async(payload.password, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Bad credentials")
-    token = create_access_token_v2(subject=user.id, role=user.role.value, company_id=user.company_id)
+    user_id, role, company_id = user.id, user.role.value, user.company_id
+    if needs_rehash(user.password_hash):
+        # Cost factor changed since this hash was stored: upgrade it while we know the password.
+        user.password_hash = await hash_password_async(payload.password)
+        await run_in_threadpool(db.commit)
+    claims = await run_in_threadpool(stateless_claims, db, user) if stateless_enabled() else None
+    token = create_access_token_v2(subject=user_id, role=role, company_id=company_id, claims=claims)
     return TokenResponse(access_token=token)
 
 
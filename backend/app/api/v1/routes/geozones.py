@@ -3,10 +3,13 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user, require_permissions
+from app.api.v1.conditional import conditional
+from app.api.v1.deps import get_current_user, get_read_db, require_permissions
+from app.api.v1.fields import Projection
+from app.api.v1.pagination import Page
 from app.db.session import get_db
 from app.models.enums import GeozoneType
 from app.models.geozone import Geozone, GeozoneEvent, VehicleGeozoneState
@@ -15,26 +18,46 @@ from app.schemas.geozone import GeozoneCreate, GeozoneEventOut, GeozoneOut, Geoz
 from app.services.audit import write_audit
 from app.services.events import publish_event
 from app.services.geo import haversine_m, point_in_polygon
+from app.services.reference_data import active_geozones
 
 
 router = APIRouter()
 
 
-def _is_inside(zone: Geozone, lat: float, lon: float) -> bool:
-    if zone.zone_type == GeozoneType.circle:
-        if zone.center_lat is None or zone.center_lon is None or zone.radius_m is None:
+def _is_inside(zone: dict, lat: float, lon: float) -> bool:
+    if zone["zone_type"] == GeozoneType.circle:
+        if zone["center_lat"] is None or zone["center_lon"] is None or zone["radius_m"] is None:
             return False
-        return haversine_m(lat, lon, zone.center_lat, zone.center_lon) <= float(zone.radius_m)
-    if zone.zone_type == GeozoneType.polygon:
-        if not zone.polygon:
+        return haversine_m(lat, lon, zone["center_lat"], zone["center_lon"]) <= float(zone["radius_m"])
+    if zone["zone_type"] == GeozoneType.polygon:
+        if not zone["polygon"]:
             return False
-        return point_in_polygon(lat, lon, zone.polygon)
+        return point_in_polygon(lat, lon, zone["polygon"])
     return False
 
 
-@router.get("", response_model=list[GeozoneOut], dependencies=[Depends(require_permissions("geozones.read"))])
-def list_geozones(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    return db.query(Geozone).filter(Geozone.company_id == user.company_id).order_by(Geozone.created_at.desc()).all()
+_PROJECTION = Projection(Geozone, GeozoneOut)
+# History is ordered by when the event happened, not when it was stored.
+_EVENTS_PROJECTION = Projection(GeozoneEvent, GeozoneEventOut, order_by="occurred_at")
+
+
+@router.get(
+    "",
+    response_model=list[GeozoneOut],
+    dependencies=[Depends(require_permissions("geozones.read")), Depends(conditional("geozones"))],
+)
+def list_geozones(
+    request: Request,
+    response: Response,
+    page: Page = Depends(),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    def load_rows():
+        return db.execute(_PROJECTION.select_page(page, None, Geozone.company_id == user.company_id)).all()
+
+    # Polygons make this the largest reference payload: served precompressed from the cache.
+    return _PROJECTION.render_cached(request, response, user.company_id, "geozones", page, load_rows)
 
 
 @router.post("", response_model=GeozoneOut, dependencies=[Depends(require_permissions("geozones.write"))])
@@ -64,6 +87,7 @@ def create_geozone(payload: GeozoneCreate, db: Session = Depends(get_db), user:
     write_audit(db, company_id=user.company_id, entity_type="geozone", entity_id=z.id, action="create", actor_user_id=user.id, payload=payload.model_dump())
     db.commit()
     db.refresh(z)
+    publish_event(user.company_id, {"type": "geozone.created", "geozone_id": z.id})
     return z
 
 
@@ -80,6 +104,7 @@ def update_geozone(geozone_id: str, payload: GeozoneUpdate, db: Session = Depend
     write_audit(db, company_id=user.company_id, entity_type="geozone", entity_id=z.id, action="update", actor_user_id=user.id, payload=data)
     db.commit()
     db.refresh(z)
+    publish_event(user.company_id, {"type": "geozone.updated", "geozone_id": z.id})
     return z
 
 
@@ -91,32 +116,28 @@ def delete_geozone(geozone_id: str, db: Session = Depends(get_db), user: User =
     db.delete(z)
     write_audit(db, company_id=user.company_id, entity_type="geozone", entity_id=geozone_id, action="delete", actor_user_id=user.id, payload={})
     db.commit()
+    publish_event(user.company_id, {"type": "geozone.deleted", "geozone_id": geozone_id})
     return {"status": "deleted"}
 
 
 @router.get("/events", response_model=list[GeozoneEventOut], dependencies=[Depends(require_permissions("geozones.read"))])
-def list_events(db: Session = Depends(get_db), user: User = Depends(get_current_user), limit: int = 200):
-    return (
-        db.query(GeozoneEvent)
-        .filter(GeozoneEvent.company_id == user.company_id)
-        .order_by(GeozoneEvent.occurred_at.desc())
-        .limit(limit)
-        .all()
-    )
+def list_events(response: Response, page: Page = Depends(), db: Session = Depends(get_read_db), user: User = Depends(get_current_user)):
+    rows = db.execute(_EVENTS_PROJECTION.select_page(page, None, GeozoneEvent.company_id == user.company_id)).all()
+    return _EVENTS_PROJECTION.render_page(response, rows, page)
 
 
 @router.post("/evaluate")
 def evaluate_position(vehicle_id: str, lat: float, lon: float, db: Session = Depends(get_db), user: User = Depends(get_current_user)):
     # Admin utility endpoint: evaluate enter/exit for one vehicle position.
     # Real path runs in telemetry ingest (future: move there and remove this endpoint).
-    zones = db.query(Geozone).filter(Geozone.company_id == user.company_id, Geozone.is_active.is_(True)).all()
+    zones = active_geozones(db, user.company_id)
     now = datetime.now(timezone.utc)
     events = 0
     for z in zones:
         inside = _is_inside(z, lat, lon)
-        state = db.query(VehicleGeozoneState).filter(VehicleGeozoneState.vehicle_id == vehicle_id, VehicleGeozoneState.geozone_id == z.id).one_or_none()
+        state = db.query(VehicleGeozoneState).filter(VehicleGeozoneState.vehicle_id == vehicle_id, VehicleGeozoneState.geozone_id == z["id"]).one_or_none()
         if not state:
-            state = VehicleGeozoneState(vehicle_id=vehicle_id, geozone_id=z.id, is_inside=inside, last_changed_at=now)
+            state = VehicleGeozoneState(vehicle_id=vehicle_id, geozone_id=z["id"], is_inside=inside, last_changed_at=now)
             db.add(state)
             continue
         if state.is_inside != inside:
@@ -126,7 +147,7 @@ def evaluate_position(vehicle_id: str, lat: float, lon: float, db: Session = Dep
                 id=str(uuid.uuid4()),
                 company_id=user.company_id,
                 vehicle_id=vehicle_id,
-                geozone_id=z.id,
+                geozone_id=z["id"],
                 event_type="enter" if inside else "exit",
                 lat=lat,
                 lon=lon,
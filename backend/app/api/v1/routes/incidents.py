@@ -3,10 +3,12 @@ from __future__ import annotations
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user, require_permissions
+from app.api.v1.deps import get_current_user, get_read_db, require_permissions
+from app.api.v1.fields import Projection
+from app.api.v1.pagination import Page
 from app.db.session import get_db
 from app.models.enums import IncidentSeverity, IncidentStatus
 from app.models.incident import Incident
@@ -19,15 +21,13 @@ from app.services.events import publish_event
 router = APIRouter()
 
 
+_PROJECTION = Projection(Incident, IncidentOut)
+
+
 @router.get("", response_model=list[IncidentOut], dependencies=[Depends(require_permissions("incidents.read"))])
-def list_incidents(db: Session = Depends(get_db), user: User = Depends(get_current_user), limit: int = 200):
-    return (
-        db.query(Incident)
-        .filter(Incident.company_id == user.company_id)
-        .order_by(Incident.created_at.desc())
-        .limit(limit)
-        .all()
-    )
+def list_incidents(response: Response, page: Page = Depends(), db: Session = Depends(get_read_db), user: User = Depends(get_current_user)):
+    rows = db.execute(_PROJECTION.select_page(page, None, Incident.company_id == user.company_id)).all()
+    return _PROJECTION.render_page(response, rows, page)
 
 
 @router.post("", response_model=IncidentOut, dependencies=[Depends(require_permissions("incidents.write"))])
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import os
+
+from fastapi import APIRouter, Depends
+
+from app.api.v1.deps import get_current_user, require_permissions
+from app.db.session import pool_metrics
+from app.models.user import User
+from app.services.cache import tenant_cache
+from app.services.events import event_bus, event_publisher
+from app.services.permissions import permission_cache
+
+
+router = APIRouter()
+
+
+@router.get("/connections", dependencies=[Depends(require_permissions("metrics.read"))])
+async def list_connections(user: User = Depends(get_current_user), limit: int = 200):
+    # Realtime connections of the company held by this worker, most lagging first.
+    # Async so the subscriber registry is read on the event loop that mutates it.
+    connections = event_bus.connections(user.company_id)
+    return {
+        "worker_pid": os.getpid(),
+        "publisher": event_publisher.stats(),
+        "total": len(connections),
+        "connections": connections[:limit],
+    }
+
+
+@router.get("/db-pool", dependencies=[Depends(require_permissions("metrics.read"))])
+async def db_pool():
+    # Per worker: Postgres needs max_connections >= workers * sum(size + max_overflow).
+    return {"worker_pid": os.getpid(), "pools": pool_metrics()}
+
+
+@router.get("/cache", dependencies=[Depends(require_permissions("metrics.read"))])
+async def cache_stats():
+    # Per worker; shared_hits are reads served by Redis after a local miss.
+    return {"worker_pid": os.getpid(), "tenant": tenant_cache.stats(), "permissions": permission_cache.stats()}
@@ -2,10 +2,13 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user, require_permissions
+from app.api.v1.deps import get_async_read_db, get_current_user, require_permissions
+from app.api.v1.fields import Projection
+from app.api.v1.pagination import Page
 from app.db.session import get_db
 from app.models.notification import Notification
 from app.models.user import User
@@ -15,15 +18,15 @@ from app.schemas.notification import NotificationMarkReadRequest, NotificationOu
 router = APIRouter()
 
 
+_PROJECTION = Projection(Notification, NotificationOut)
+
+
 @router.get("", response_model=list[NotificationOut], dependencies=[Depends(require_permissions("notifications.read"))])
-def list_notifications(db: Session = Depends(get_db), user: User = Depends(get_current_user), limit: int = 200):
-    return (
-        db.query(Notification)
-        .filter(Notification.company_id == user.company_id, Notification.user_id == user.id)
-        .order_by(Notification.created_at.desc())
-        .limit(limit)
-        .all()
-    )
+async def list_notifications(
+    response: Response, page: Page = Depends(), db: AsyncSession = Depends(get_async_read_db), user: User = Depends(get_current_user)
+):
+    stmt = _PROJECTION.select_page(page, None, Notification.company_id == user.company_id, Notification.user_id == user.id)
+    return _PROJECTION.render_page(response, (await db.execute(stmt)).all(), page)
 
 
 @router.post("/read", dependencies=[Depends(require_permissions("notifications.read"))])
@@ -1,10 +1,13 @@
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user, require_permissions
+from app.api.v1.conditional import conditional
+from app.api.v1.deps import get_current_user, get_read_db, require_permissions
+from app.api.v1.fields import Projection
+from app.api.v1.pagination import Page
 from app.db.session import get_db
 from app.models.enums import OrderStatus, UserRole
 from app.models.order import Order
@@ -15,12 +18,23 @@ from app.services.audit import write_audit
 router = APIRouter()
 
 
-@router.get("", response_model=list[OrderOut])
-def list_orders(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    q = db.query(Order).filter(Order.company_id == user.company_id)
+_PROJECTION = Projection(Order, OrderOut)
+_fields = _PROJECTION.dependency()
+
+
+@router.get("", response_model=list[OrderOut], dependencies=[Depends(conditional("orders"))])
+def list_orders(
+    response: Response,
+    page: Page = Depends(),
+    fields: tuple[str, ...] = Depends(_fields),
+    db: Session = Depends(get_read_db),
+    user: User = Depends(get_current_user),
+):
+    criteria = [Order.company_id == user.company_id]
     if UserRole(user.role) == UserRole.driver:
-        q = q.filter((Order.assigned_driver_user_id == user.id) | (Order.accepted_by_user_id == user.id))
-    return q.order_by(Order.created_at.desc()).all()
+        criteria.append((Order.assigned_driver_user_id == user.id) | (Order.accepted_by_user_id == user.id))
+    rows = db.execute(_PROJECTION.select_page(page, fields, *criteria)).all()
+    return _PROJECTION.render_page(response, rows, page, fields)
 
 
 @router.post("", response_model=OrderOut, dependencies=[Depends(require_permissions("orders.write"))])
@@ -10,6 +10,7 @@ from app.models.permission import RolePermission, UserPermissionOverride
 from app.models.user import User
 from app.schemas.permission import SetRolePermissionsRequest, SetUserOverridesRequest
 from app.services.audit import write_audit
+from app.services.permissions import bump_role_permissions_version, bump_user_permissions_version
 
 
 router = APIRouter()
@@ -37,6 +38,7 @@ def set_role_permissions(payload: SetRolePermissionsRequest, db: Session = Depen
         db.add(RolePermission(role=payload.role, permission=p))
     write_audit(db, company_id=actor.company_id, entity_type="permission", entity_id=payload.role, action="role_permissions_set", actor_user_id=actor.id, payload={"permissions": payload.permissions})
     db.commit()
+    bump_role_permissions_version()
     return {"status": "ok", "role": payload.role, "count": len(payload.permissions)}
 
 
@@ -61,4 +63,5 @@ def set_user_overrides(payload: SetUserOverridesRequest, db: Session = Depends(g
 
     write_audit(db, company_id=actor.company_id, entity_type="permission", entity_id=payload.user_id, action="user_overrides_set", actor_user_id=actor.id, payload={"overrides": [o.model_dump() for o in payload.overrides]})
     db.commit()
+    bump_user_permissions_version(payload.user_id)
     return {"status": "ok", "user_id": payload.user_id, "count": len(payload.overrides)}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.serialization import dumps
+from app.core.settings import settings
+from app.services.event_coalescing import batch_frame, coalesce_window, next_events
+from app.services.event_subscriptions import (
+    authenticate_stream,
+    build_filter,
+    connection_info,
+    parse_filter,
+    replay_since,
+)
+from app.services.events import ReplayGap, SubscriptionFilter, event_bus, event_offset
+
+
+router = APIRouter()
+
+# Reconnect delay suggested to EventSource clients.
+_RETRY_MS = 3000
+
+
+def _message(data: str, offset: int | None = None) -> str:
+    # Frames are single-line JSON, so one `data:` field is enough.
+    if offset:
+        return f"id: {offset}\ndata: {data}\n\n"
+    return f"data: {data}\n\n"
+
+
+async def _sse_chunks(
+    company_id: str, flt: SubscriptionFilter | None, info: dict, since: int | None, window: float
+) -> AsyncIterator[str]:
+    # Subscribed inside the generator so it is always paired with the unsubscribe below.
+    q = await event_bus.subscribe(company_id, flt, info)
+    try:
+        yield f"retry: {_RETRY_MS}\n\n"
+        after = 0
+        if since is not None:
+            try:
+                events, after = await replay_since(company_id, since, flt)
+            except ReplayGap as gap:
+                yield _message(dumps({"type": "resync_required", "since": gap.since, "oldest": gap.oldest, "latest": gap.latest}))
+            else:
+                for evt in events:
+                    yield _message(evt.frame, event_offset(evt))
+        while not q.evicted.is_set():
+            try:
+                first = await asyncio.wait_for(q.get(), timeout=settings.sse_heartbeat_s)
+            except asyncio.TimeoutError:
+                # Comment line: keeps proxies from timing out an idle stream.
+                yield ": ping\n\n"
+                continue
+            events = await next_events(q, window, after, first)
+            yield _message(batch_frame(events), max(event_offset(e) for e in events))
+        # Evicted as a slow consumer: end the response; EventSource reconnects with Last-Event-ID.
+    finally:
+        await event_bus.unsubscribe(company_id, q)
+
+
+@router.get("/stream")
+async def stream_events(request: Request):
+    """Server-Sent Events over the same bus as /ws (same filters and coalescing params).
+
+    Every message id is the event offset, so a reconnecting EventSource resumes through its
+    `Last-Event-ID` header (or `?since=`).
+    """
+    principal = await authenticate_stream(request)
+    if principal is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    try:
+        flt = build_filter(principal, *parse_filter(request.query_params))
+        last_id = request.headers.get("last-event-id") or request.query_params.get("since")
+        since = int(last_id) if last_id else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    window = coalesce_window(request.query_params.get("coalesce_ms"))
+    return StreamingResponse(
+        _sse_chunks(principal.company_id, flt, connection_info(request, principal), since, window),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -6,15 +6,18 @@ import secrets
 import uuid
 from datetime import datetime, timezone
 
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user, require_permissions
+from app.api.v1.deps import get_current_user, get_read_db, require_permissions
+from app.api.v1.fields import Projection
+from app.api.v1.pagination import Page
 from app.db.session import get_db
 from app.models.telemetry import TelemetryApiKey, VehiclePosition
 from app.models.user import User
 from app.models.vehicle import Vehicle
-from app.models.geozone import Geozone, GeozoneEvent, VehicleGeozoneState
+from app.models.geozone import GeozoneEvent, VehicleGeozoneState
 from app.models.enums import GeozoneEventType, GeozoneType
 from app.schemas.telemetry import (
     TelemetryApiKeyCreateRequest,
@@ -24,8 +27,10 @@ from app.schemas.telemetry import (
 )
 from app.services.audit import write_audit
 from app.services.events import publish_event
+from app.services.fleet_state import changed_fields, fleet_delta, vehicle_state
 from app.services.redis_client import get_redis
 from app.services.geo import haversine_m, point_in_polygon
+from app.services.reference_data import active_geozones
 
 
 router = APIRouter()
@@ -53,13 +58,16 @@ def create_api_key(payload: TelemetryApiKeyCreateRequest, db: Session = Depends(
     return TelemetryApiKeyCreated(id=row.id, name=row.name, api_key=raw)
 
 
+_PROJECTION = Projection(TelemetryApiKey, TelemetryApiKeyOut)
+
+
 @router.get("/api-keys", response_model=list[TelemetryApiKeyOut], dependencies=[Depends(require_permissions("vehicles.read"))])
-def list_api_keys(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    return db.query(TelemetryApiKey).filter(TelemetryApiKey.company_id == user.company_id).order_by(TelemetryApiKey.created_at.desc()).all()
+def list_api_keys(response: Response, page: Page = Depends(), db: Session = Depends(get_read_db), user: User = Depends(get_current_user)):
+    rows = db.execute(_PROJECTION.select_page(page, None, TelemetryApiKey.company_id == user.company_id)).all()
+    return _PROJECTION.render_page(response, rows, page)
 
 
-@router.post("/ingest")
-def ingest(payload: TelemetryIngestRequest, db: Session = Depends(get_db), x_api_key: str | None = Header(default=None, alias="X-API-Key")):
+def _load_api_key(db: Session, x_api_key: str | None) -> tuple[TelemetryApiKey, str]:
     if not x_api_key:
         raise HTTPException(status_code=401, detail="Missing API key")
 
@@ -67,7 +75,10 @@ def ingest(payload: TelemetryIngestRequest, db: Session = Depends(get_db), x_api
     api_key = db.query(TelemetryApiKey).filter(TelemetryApiKey.key_hash == key_hash, TelemetryApiKey.is_active.is_(True)).first()
     if not api_key:
         raise HTTPException(status_code=401, detail="Invalid API key")
+    return api_key, key_hash
 
+
+def _check_rate_limit(key_hash: str, limit_per_min: int) -> None:
     # Rate limit via Redis token bucket per minute
     r = get_redis()
     minute = datetime.now(timezone.utc).strftime("%Y%m%d%H%M")
@@ -75,21 +86,32 @@ def ingest(payload: TelemetryIngestRequest, db: Session = Depends(get_db), x_api
     current = r.incr(rl_key)
     if current == 1:
         r.expire(rl_key, 70)
-    if current > int(api_key.rate_limit_per_min):
+    if current > int(limit_per_min):
         raise HTTPException(status_code=429, detail="Rate limit exceeded")
 
-    now = datetime.now(timezone.utc)
-    api_key.last_used_at = now
 
-    zones = db.query(Geozone).filter(Geozone.company_id == api_key.company_id, Geozone.is_active.is_(True)).all()
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+def _apply_updates(db: Session, company_id: str, payload: TelemetryIngestRequest, now: datetime) -> tuple[dict, dict[str, dict]]:
+    """Applies one ingest batch to vehicles, positions and geozone states (no commit)."""
+    zones = active_geozones(db, company_id)
 
     updated = 0
     positions = 0
     zone_events = 0
-    for u in payload.updates:
-        v = db.get(Vehicle, u.vehicle_id)
-        if not v or v.company_id != api_key.company_id:
+    deltas: dict[str, dict] = {}
+    # Row locks serialize concurrent batches per vehicle (state_version, last position); taking
+    # them in vehicle id order keeps two batches from deadlocking. The sort is stable, so updates
+    # of one vehicle keep their order.
+    for u in sorted(payload.updates, key=lambda u: u.vehicle_id):
+        v = db.get(Vehicle, u.vehicle_id, with_for_update={"of": Vehicle})
+        if not v or v.company_id != company_id:
             continue
+        before = vehicle_state(v)
+        zones_before: set[str] = set()
+        zones_after: set[str] = set()
 
         # Telemetry fields
         if u.load_pct is not None:
@@ -105,10 +127,10 @@ def ingest(payload: TelemetryIngestRequest, db: Session = Depends(get_db), x_api
 
         # Position
         if u.lat is not None and u.lon is not None:
-            recorded_at = u.recorded_at or now
+            recorded_at = _as_utc(u.recorded_at) if u.recorded_at else now
             pos = VehiclePosition(
                 id=str(uuid.uuid4()),
-                company_id=api_key.company_id,
+                company_id=company_id,
                 vehicle_id=v.id,
                 lat=float(u.lat),
                 lon=float(u.lon),
@@ -118,50 +140,96 @@ def ingest(payload: TelemetryIngestRequest, db: Session = Depends(get_db), x_api
             )
             db.add(pos)
             positions += 1
-
-            # Evaluate geozones and create enter/exit events
-            lat = float(u.lat)
-            lon = float(u.lon)
-            for z in zones:
-                if z.zone_type == GeozoneType.circle:
-                    if z.center_lat is None or z.center_lon is None or z.radius_m is None:
-                        continue
-                    inside = haversine_m(lat, lon, z.center_lat, z.center_lon) <= float(z.radius_m)
-                else:
-                    if not z.polygon:
-                        continue
-                    inside = point_in_polygon(lat, lon, z.polygon)
-
-                state = (
-                    db.query(VehicleGeozoneState)
-                    .filter(VehicleGeozoneState.vehicle_id == v.id, VehicleGeozoneState.geozone_id == z.id)
-                    .one_or_none()
-                )
-                if not state:
-                    db.add(VehicleGeozoneState(vehicle_id=v.id, geozone_id=z.id, is_inside=inside, last_changed_at=recorded_at))
-                    continue
-                if state.is_inside != inside:
-                    state.is_inside = inside
-                    state.last_changed_at = recorded_at
-                    evt = GeozoneEvent(
-                        id=str(uuid.uuid4()),
-                        company_id=api_key.company_id,
-                        vehicle_id=v.id,
-                        geozone_id=z.id,
-                        event_type=GeozoneEventType.enter if inside else GeozoneEventType.exit,
-                        lat=lat,
-                        lon=lon,
-                        occurred_at=recorded_at,
+            # Late points (buffered on the device, retried) only go to the history: neither
+            # the live position nor geozone states move back in time.
+            if v.last_position_at is None or recorded_at >= _as_utc(v.last_position_at):
+                v.last_position_at = recorded_at
+                v.last_lat = pos.lat
+                v.last_lon = pos.lon
+                v.last_speed_kph = u.speed_kph
+                v.last_heading = u.heading
+
+                # Evaluate geozones and create enter/exit events
+                lat = float(u.lat)
+                lon = float(u.lon)
+                for z in zones:
+                    if z["zone_type"] == GeozoneType.circle:
+                        if z["center_lat"] is None or z["center_lon"] is None or z["radius_m"] is None:
+                            continue
+                        inside = haversine_m(lat, lon, z["center_lat"], z["center_lon"]) <= float(z["radius_m"])
+                    else:
+                        if not z["polygon"]:
+                            continue
+                        inside = point_in_polygon(lat, lon, z["polygon"])
+
+                    state = (
+                        db.query(VehicleGeozoneState)
+                        .filter(VehicleGeozoneState.vehicle_id == v.id, VehicleGeozoneState.geozone_id == z["id"])
+                        .one_or_none()
                     )
-                    db.add(evt)
-                    zone_events += 1
+                    if state and state.is_inside:
+                        zones_before.add(z["id"])
+                    if inside:
+                        zones_after.add(z["id"])
+                    if not state:
+                        db.add(VehicleGeozoneState(vehicle_id=v.id, geozone_id=z["id"], is_inside=inside, last_changed_at=recorded_at))
+                        continue
+                    if state.is_inside != inside:
+                        state.is_inside = inside
+                        state.last_changed_at = recorded_at
+                        evt = GeozoneEvent(
+                            id=str(uuid.uuid4()),
+                            company_id=company_id,
+                            vehicle_id=v.id,
+                            geozone_id=z["id"],
+                            event_type=GeozoneEventType.enter if inside else GeozoneEventType.exit,
+                            lat=lat,
+                            lon=lon,
+                            occurred_at=recorded_at,
+                        )
+                        db.add(evt)
+                        zone_events += 1
+
+        # Only the fields that changed, stamped with the new state version.
+        changed = changed_fields(before, vehicle_state(v))
+        if zones_before != zones_after:
+            changed["zones"] = sorted(zones_after)
+        if changed:
+            v.state_version = (v.state_version or 0) + 1
+            deltas[v.id] = {**deltas.get(v.id, {}), **fleet_delta(v, changed, now.isoformat())}
+
+    return {"updated": updated, "positions": positions, "geozone_events": zone_events}, deltas
+
+
+def _publish_ingest(company_id: str, stats: dict, deltas: dict[str, dict], now: datetime) -> dict:
+    # One delta per vehicle in this batch; across batches they are merged per WebSocket
+    # connection (services.event_coalescing).
+    for delta in deltas.values():
+        publish_event(company_id, delta)
+    publish_event(company_id, {"type": "telemetry.ingested", **stats, "at": now.isoformat()})
+    if stats["geozone_events"]:
+        publish_event(company_id, {"type": "geozone.events", "count": stats["geozone_events"], "at": now.isoformat()})
+    return {"status": "ok", **stats}
+
+
+def _ingest(db: Session, payload: TelemetryIngestRequest, x_api_key: str | None) -> dict:
+    api_key, key_hash = _load_api_key(db, x_api_key)
+    _check_rate_limit(key_hash, api_key.rate_limit_per_min)
 
+    now = datetime.now(timezone.utc)
+    api_key.last_used_at = now
+    company_id = api_key.company_id
+    stats, deltas = _apply_updates(db, company_id, payload, now)
     db.commit()
+    return _publish_ingest(company_id, stats, deltas, now)
 
-    publish_event(
-        api_key.company_id,
-        {"type": "telemetry.ingested", "updated": updated, "positions": positions, "geozone_events": zone_events, "at": now.isoformat()},
-    )
-    if zone_events:
-        publish_event(api_key.company_id, {"type": "geozone.events", "count": zone_events, "at": now.isoformat()})
-    return {"status": "ok", "updated": updated, "positions": positions, "geozone_events": zone_events}
+
+@router.post("/ingest")
+async def ingest(
+    payload: TelemetryIngestRequest,
+    db: Session = Depends(get_db),
+    x_api_key: str | None = Header(default=None, alias="X-API-Key"),
+):
+    # Redis (rate limit, cached geozones), the geozone math and the per-zone state queries all
+    # block: the whole batch runs on the threadpool in one hop.
+    return await run_in_threadpool(_ingest, db, payload, x_api_key)
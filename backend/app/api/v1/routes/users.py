@@ -1,41 +1,71 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user, require_permissions
-from app.core.security import hash_password
+from app.api.v1.conditional import conditional
+from app.api.v1.deps import get_current_user, get_read_db, require_permissions
+from app.api.v1.fields import Projection
+from app.api.v1.pagination import Page
+from app.core.security import hash_password_async
 from app.db.session import get_db
+from app.models.enums import UserRole
 from app.models.user import User
 from app.schemas.user import UserCreate, UserOut, UserRoleUpdate
 from app.services.audit import write_audit
+from app.services.events import publish_event
+from app.services.permissions import bump_user_state_version
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[UserOut], dependencies=[Depends(require_permissions("users.read"))])
-def list_users(db: Session = Depends(get_db), actor: User = Depends(get_current_user)):
-    return db.query(User).filter(User.company_id == actor.company_id).order_by(User.created_at.desc()).all()
+_PROJECTION = Projection(User, UserOut)
+
+
+@router.get(
+    "",
+    response_model=list[UserOut],
+    dependencies=[Depends(require_permissions("users.read")), Depends(conditional("users"))],
+)
+def list_users(
+    request: Request,
+    response: Response,
+    page: Page = Depends(),
+    db: Session = Depends(get_read_db),
+    actor: User = Depends(get_current_user),
+):
+    def load_rows():
+        return db.execute(_PROJECTION.select_page(page, None, User.company_id == actor.company_id)).all()
+
+    return _PROJECTION.render_cached(request, response, actor.company_id, "users", page, load_rows)
 
 
 @router.post("", response_model=UserOut, dependencies=[Depends(require_permissions("users.write"))])
-def create_user(payload: UserCreate, db: Session = Depends(get_db), actor: User = Depends(get_current_user)):
+async def create_user(payload: UserCreate, db: Session = Depends(get_db), actor: User = Depends(get_current_user)):
+    # Validate before hashing: rejected requests must not take a slot in the password pool.
+    role = await run_in_threadpool(_check_new_user, payload, db)
+    password_hash = await hash_password_async(payload.password)
+    return await run_in_threadpool(_create_user, payload, db, actor, role, password_hash)
+
+
+def _check_new_user(payload: UserCreate, db: Session) -> UserRole:
     existing = db.query(User).filter(User.email == payload.email).first()
     if existing:
         raise HTTPException(status_code=409, detail="User with this email already exists")
 
-    from app.models.enums import UserRole
-
     try:
-        role = UserRole(payload.role)
+        return UserRole(payload.role)
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid role. Must be one of: {[r.value for r in UserRole]}")
 
+
+def _create_user(payload: UserCreate, db: Session, actor: User, role: UserRole, password_hash: str) -> User:
     u = User(
         id=str(uuid.uuid4()),
         company_id=actor.company_id,
         email=payload.email,
-        password_hash=hash_password(payload.password),
+        password_hash=password_hash,
         role=role,
         is_active=True,
     )
@@ -43,6 +73,7 @@ def create_user(payload: UserCreate, db: Session = Depends(get_db), actor: User
     write_audit(db, company_id=actor.company_id, entity_type="user", entity_id=u.id, action="create", actor_user_id=actor.id, payload={"email": payload.email, "role": role.value})
     db.commit()
     db.refresh(u)
+    publish_event(actor.company_id, {"type": "user.created", "user_id": u.id})
     return u
 
 
@@ -65,5 +96,8 @@ def update_user(user_id: str, payload: UserRoleUpdate, db: Session = Depends(get
 
     write_audit(db, company_id=actor.company_id, entity_type="user", entity_id=u.id, action="update", actor_user_id=actor.id, payload=payload.model_dump())
     db.commit()
+    # Outstanding stateless tokens carry the old role/active state.
+    bump_user_state_version(u.id)
     db.refresh(u)
+    publish_event(actor.company_id, {"type": "user.updated", "user_id": u.id})
     return u
@@ -1,29 +1,56 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.api.v1.deps import get_current_user, require_permissions
+from app.api.v1.conditional import conditional
+from app.api.v1.deps import get_async_read_db, get_current_user, require_permissions
+from app.api.v1.fields import Embedded, Projection
+from app.api.v1.pagination import Page
 from app.db.session import get_db
 from app.models.driver import DriverProfile
 from app.models.enums import UserRole
 from app.models.user import User
 from app.models.vehicle import Vehicle
-from app.schemas.vehicle import VehicleCreate, VehicleOut, VehicleUpdate
+from app.schemas.vehicle import DriverProfileEmbedded, VehicleCreate, VehicleOut, VehicleUpdate
 from app.services.audit import write_audit
+from app.services.events import publish_event
 
 router = APIRouter()
 
 
-@router.get("", response_model=list[VehicleOut])
-def list_vehicles(db: Session = Depends(get_db), user: User = Depends(get_current_user)):
-    q = db.query(Vehicle).filter(Vehicle.company_id == user.company_id)
+_PROJECTION = Projection(
+    Vehicle,
+    VehicleOut,
+    embedded={"driver": Embedded(DriverProfile, Vehicle.driver_profile_id == DriverProfile.id, DriverProfileEmbedded)},
+)
+_fields = _PROJECTION.dependency()
+
+
+def _visible(user: User) -> list:
+    criteria = [Vehicle.company_id == user.company_id]
     if UserRole(user.role) == UserRole.driver:
-        dp = db.query(DriverProfile).filter(DriverProfile.user_id == user.id, DriverProfile.company_id == user.company_id).first()
-        if not dp:
-            return []
-        q = q.filter(Vehicle.driver_profile_id == dp.id)
-    return q.order_by(Vehicle.created_at.desc()).all()
+        criteria.append(
+            Vehicle.driver_profile_id.in_(
+                select(DriverProfile.id).where(DriverProfile.user_id == user.id, DriverProfile.company_id == user.company_id)
+            )
+        )
+    return criteria
+
+
+# Responses embed the driver, so driver profile changes count too.
+@router.get("", response_model=list[VehicleOut], dependencies=[Depends(conditional("vehicles", "driver_profiles"))])
+async def list_vehicles(
+    response: Response,
+    page: Page = Depends(),
+    fields: tuple[str, ...] = Depends(_fields),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: User = Depends(get_current_user),
+):
+    rows = (await db.execute(_PROJECTION.select_page(page, fields, *_visible(user)))).all()
+    return _PROJECTION.render_page(response, rows, page, fields)
 
 
 @router.post("", response_model=VehicleOut, dependencies=[Depends(require_permissions("vehicles.write"))])
@@ -77,6 +104,7 @@ def create_vehicle(payload: VehicleCreate, db: Session = Depends(get_db), user:
     )
     db.commit()
     db.refresh(v)
+    publish_event(user.company_id, {"type": "vehicle.created", "vehicle_id": v.id})
     return v
 
 
@@ -95,6 +123,7 @@ def update_vehicle(vehicle_id: str, payload: VehicleUpdate, db: Session = Depend
     write_audit(db, company_id=user.company_id, entity_type="vehicle", entity_id=v.id, action="update", actor_user_id=user.id, payload=data)
     db.commit()
     db.refresh(v)
+    publish_event(user.company_id, {"type": "vehicle.updated", "vehicle_id": v.id})
     return v
 
 
@@ -108,4 +137,5 @@ def delete_vehicle(vehicle_id: str, db: Session = Depends(get_db), user: User =
     db.delete(v)
     write_audit(db, company_id=user.company_id, entity_type="vehicle", entity_id=vehicle_id, action="delete", actor_user_id=user.id, payload={})
     db.commit()
+    publish_event(user.company_id, {"type": "vehicle.deleted", "vehicle_id": vehicle_id})
     return {"status": "deleted"}
@@ -1,54 +1,191 @@
 from __future__ import annotations
 
+import asyncio
+from typing import Awaitable, Callable
+
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
-from jose import jwt
 
-from app.core.settings import settings
-from app.services.events import event_bus
+from app.services.event_coalescing import batch_frame, coalesce_window, next_frame
+from app.services.event_subscriptions import (
+    StreamPrincipal,
+    authenticate_stream,
+    build_filter,
+    connection_info,
+    parse_filter,
+    replay_since,
+)
+from app.services.events import ReplayGap, Subscriber, SubscriptionFilter, event_bus
+from app.services.fleet_state import DELTA_TYPE, load_snapshot
 
 
 router = APIRouter()
 
+_REPLAY_BATCH = 200
+# Closed for falling behind: reconnect with ?since=<last offset> (or refetch on resync_required).
+RESYNC_CLOSE_CODE = 4409
 
-def _extract_token(ws: WebSocket) -> str | None:
-    # Prefer query param for simplicity in browser WS.
-    token = ws.query_params.get("token")
-    if token:
-        return token
-    auth = ws.headers.get("authorization")
-    if auth and auth.lower().startswith("bearer "):
-        return auth.split(" ", 1)[1]
-    return None
+OnFilter = Callable[[SubscriptionFilter | None], Awaitable[None]]
 
 
 @router.websocket("/ws")
 async def ws_endpoint(ws: WebSocket):
-    token = _extract_token(ws)
-    if not token:
+    principal = await authenticate_stream(ws)
+    if principal is None:
         await ws.close(code=4401)
         return
+    try:
+        flt = build_filter(principal, *parse_filter(ws.query_params))
+        since = int(ws.query_params["since"]) if ws.query_params.get("since") else None
+    except ValueError:
+        await ws.close(code=4400)
+        return
 
+    await ws.accept()
+    q = await event_bus.subscribe(principal.company_id, flt, connection_info(ws, principal))
     try:
-        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_alg])
+        await ws.send_json(
+            {
+                "type": "connected",
+                "company_id": principal.company_id,
+                "user_id": principal.user_id,
+                "offset": await event_bus.latest_offset(principal.company_id),
+            }
+        )
+        after = 0
+        if since is not None:
+            after = await _send_replay(ws, principal.company_id, since, flt)
+        await _stream(ws, principal, q, coalesce_window(ws.query_params.get("coalesce_ms")), after)
+    except WebSocketDisconnect:
+        await event_bus.unsubscribe(principal.company_id, q)
     except Exception:
-        await ws.close(code=4401)
-        return
+        await event_bus.unsubscribe(principal.company_id, q)
+        await ws.close(code=1011)
+
 
-    company_id = payload.get("company_id")
-    user_id = payload.get("sub")
-    if not company_id or not user_id:
+@router.websocket("/ws/fleet")
+async def ws_fleet(ws: WebSocket):
+    """Live fleet state: a snapshot on subscribe, then `fleet.delta` events with changed fields only.
+
+    Every vehicle entry carries its state version `v`; clients apply a delta only when its `v`
+    is newer than the one they hold (deltas racing the snapshot are then ignored).
+    """
+    principal = await authenticate_stream(ws)
+    if principal is None:
         await ws.close(code=4401)
         return
+    types = {DELTA_TYPE}
+    try:
+        vehicle_ids, _, bbox = parse_filter(ws.query_params)
+        flt = build_filter(principal, vehicle_ids, types, bbox)
+    except ValueError:
+        await ws.close(code=4400)
+        return
+
+    async def send_snapshot(current: SubscriptionFilter | None) -> None:
+        vehicles = await load_snapshot(principal.company_id, current)
+        await ws.send_json(
+            {
+                "type": "fleet.snapshot",
+                "offset": await event_bus.latest_offset(principal.company_id),
+                "vehicles": vehicles,
+            }
+        )
 
     await ws.accept()
-    q = event_bus.subscribe(company_id)
+    # Subscribe before reading the snapshot so no delta falls between the two.
+    q = await event_bus.subscribe(principal.company_id, flt, connection_info(ws, principal))
     try:
-        await ws.send_json({"type": "connected", "company_id": company_id, "user_id": user_id})
-        while True:
-            event = await q.get()
-            await ws.send_json(event)
+        await send_snapshot(flt)
+        await _stream(ws, principal, q, coalesce_window(ws.query_params.get("coalesce_ms")), 0, types=types, on_filter=send_snapshot)
     except WebSocketDisconnect:
-        event_bus.unsubscribe(company_id, q)
+        await event_bus.unsubscribe(principal.company_id, q)
     except Exception:
-        event_bus.unsubscribe(company_id, q)
+        await event_bus.unsubscribe(principal.company_id, q)
         await ws.close(code=1011)
+
+
+async def _stream(
+    ws: WebSocket,
+    principal: StreamPrincipal,
+    q: Subscriber,
+    window: float,
+    after: int,
+    *,
+    types: set[str] | None = None,
+    on_filter: OnFilter | None = None,
+) -> None:
+    evicted = asyncio.create_task(q.evicted.wait())
+    tasks = {
+        asyncio.create_task(_send_loop(ws, q, window, after)),
+        asyncio.create_task(_receive_loop(ws, principal, q, types, on_filter)),
+        evicted,
+    }
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if evicted in done:
+        # Persistently slow consumer: stop buffering for it; the client resumes from its offset.
+        await event_bus.unsubscribe(principal.company_id, q)
+        await ws.close(code=RESYNC_CLOSE_CODE, reason="slow consumer, resync required")
+        return
+    # Surface the first failure (usually WebSocketDisconnect) of the loop that ended.
+    for task in done:
+        if not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+
+
+async def _send_replay(ws: WebSocket, company_id: str, since: int, flt: SubscriptionFilter | None) -> int:
+    # Reconnect with ?since=<last seen offset>: send the gap, or tell the client to refetch.
+    try:
+        events, covered = await replay_since(company_id, since, flt)
+    except ReplayGap as gap:
+        await ws.send_json({"type": "resync_required", "since": gap.since, "oldest": gap.oldest, "latest": gap.latest})
+        return 0
+    for i in range(0, len(events), _REPLAY_BATCH):
+        await ws.send_text(batch_frame(events[i : i + _REPLAY_BATCH]))
+    return covered
+
+
+async def _send_loop(ws: WebSocket, q: Subscriber, window: float, after: int) -> None:
+    while True:
+        # Frames were encoded once at publish for all subscribers.
+        await ws.send_text(await next_frame(q, window, after))
+
+
+async def _receive_loop(
+    ws: WebSocket,
+    principal: StreamPrincipal,
+    q: Subscriber,
+    types: set[str] | None,
+    on_filter: OnFilter | None,
+) -> None:
+    # Clients change topics without reconnecting:
+    # {"action": "subscribe", "vehicles": [...], "types": [...], "bbox": [min_lon, min_lat, max_lon, max_lat]}
+    # `types` pins the event types of dedicated channels (/ws/fleet).
+    while True:
+        try:
+            msg = await ws.receive_json()
+        except ValueError:
+            continue
+        if not isinstance(msg, dict) or msg.get("action") != "subscribe":
+            continue
+        try:
+            vehicle_ids, requested_types, bbox = parse_filter(msg)
+            flt = build_filter(principal, vehicle_ids, types or requested_types, bbox)
+        except (TypeError, ValueError) as e:
+            await ws.send_json({"type": "error", "detail": str(e)})
+            continue
+        await event_bus.update_filter(principal.company_id, q, flt)
+        await ws.send_json(
+            {
+                "type": "subscribed",
+                "vehicles": sorted(flt.vehicle_ids) if flt and flt.vehicle_ids is not None else None,
+                "types": sorted(flt.types) if flt and flt.types is not None else None,
+                "bbox": list(flt.bbox) if flt and flt.bbox else None,
+            }
+        )
+        if on_filter is not None:
+            await on_filter(flt)
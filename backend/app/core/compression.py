@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.settings import settings
+
+# brotli and zstandard are optional; without them those encodings are never offered.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class _Gzip:
+    def __init__(self) -> None:
+        self._c = zlib.compressobj(settings.compression_gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+class _Brotli:
+    def __init__(self) -> None:
+        self._c = brotli.Compressor(quality=settings.compression_brotli_quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+class _Zstd:
+    def __init__(self) -> None:
+        self._c = zstandard.ZstdCompressor(level=settings.compression_zstd_level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._c.flush()
+
+
+_CODECS = {"gzip": _Gzip}
+if brotli is not None:
+    _CODECS["br"] = _Brotli
+if zstandard is not None:
+    _CODECS["zstd"] = _Zstd
+
+# Server preference order, restricted to what is installed.
+ENCODINGS = [name for name in settings.compression_encodings if name in _CODECS]
+
+
+def negotiate(accept_encoding: str | None) -> str | None:
+    """Encoding to use for a request's Accept-Encoding: highest q, then server preference."""
+    if not accept_encoding or not ENCODINGS:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    best, best_q = None, 0.0
+    for name in ENCODINGS:
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    codec = _CODECS[encoding]()
+    return codec.compress(body) + codec.finish()
+
+
+class CompressionMiddleware:
+    """Compresses responses with the best encoding the client accepts.
+
+    Only responses whose content type is allow-listed are touched, and complete bodies only
+    from `min_size` bytes on. Responses that already carry a Content-Encoding (precompressed
+    bodies) pass through. Streamed bodies are compressed chunk by chunk and flushed after
+    each chunk, so clients still see every chunk when it is sent.
+    """
+
+    def __init__(self, app: ASGIApp, min_size: int, content_types: list[str]) -> None:
+        self.app = app
+        self.min_size = min_size
+        self.content_types = frozenset(content_types)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.min_size, self.content_types))
+
+
+class _CompressingSend:
+    def __init__(self, send: Send, encoding: str, min_size: int, content_types: frozenset[str]) -> None:
+        self._send = send
+        self._encoding = encoding
+        self._min_size = min_size
+        self._content_types = content_types
+        self._start: Message | None = None
+        self._codec = None
+        self._passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            if "content-encoding" in headers or content_type not in self._content_types or message["status"] in (204, 304):
+                self._passthrough = True
+                await self._send(message)
+            else:
+                # Held until the first body chunk tells whether the body is complete.
+                self._start = message
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._start is not None:
+            start, self._start = self._start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                if len(body) >= self._min_size:
+                    body = compress(body, self._encoding)
+                    headers["Content-Encoding"] = self._encoding
+                    headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            self._codec = _CODECS[self._encoding]()
+            headers["Content-Encoding"] = self._encoding
+            if "content-length" in headers:
+                del headers["Content-Length"]
+            await self._send(start)
+
+        data = self._codec.compress(body) + (self._codec.flush() if more_body else self._codec.finish())
+        await self._send({"type": "http.response.body", "body": data, "more_body": more_body})
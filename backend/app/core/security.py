@@ -1,3 +1,5 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 
 import bcrypt
@@ -6,14 +8,14 @@ from jose import jwt
 from app.core.settings import settings
 
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: int | None = None) -> str:
     # Bcrypt has a 72-byte limit, so we need to truncate if necessary
     password_bytes = password.encode('utf-8')
     if len(password_bytes) > 72:
         password_bytes = password_bytes[:72]
     
     # Generate salt and hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or settings.bcrypt_rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -28,6 +30,65 @@ def verify_password(password: str, password_hash: str) -> bool:
     return bcrypt.checkpw(password_bytes, hash_bytes)
 
 
+def needs_rehash(password_hash: str) -> bool:
+    # "$2b$12$..." -> cost 12
+    try:
+        return int(password_hash.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return False
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password hashes queued; the request should be retried later (HTTP 503)."""
+
+
+class _PasswordHasher:
+    """Dedicated, bounded pool for bcrypt so logins cannot starve the request threadpool.
+
+    Async handlers await the pool instead of blocking a threadpool slot for the ~250 ms a hash
+    takes. Work beyond `workers + max_pending` is rejected immediately.
+    """
+
+    def __init__(self) -> None:
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            workers = settings.password_hash_workers
+            if settings.password_hash_executor == "process":
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, fn, *args):
+        if self._pending >= settings.password_hash_workers + settings.password_hash_max_pending:
+            raise PasswordHasherBusy()
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = _PasswordHasher()
+
+
+async def hash_password_async(password: str) -> str:
+    # Cost passed explicitly: process-pool workers must not depend on their own settings.
+    return await password_hasher.run(hash_password, password, settings.bcrypt_rounds)
+
+
+async def verify_password_async(password: str, password_hash: str) -> bool:
+    return await password_hasher.run(verify_password, password, password_hash)
+
+
 def create_access_token(subject: str, role: str) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt_expires_min)
     payload = {
@@ -40,7 +101,7 @@ def create_access_token(subject: str, role: str) -> str:
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_alg)
 
 
-def create_access_token_v2(*, subject: str, role: str, company_id: str) -> str:
+def create_access_token_v2(*, subject: str, role: str, company_id: str, claims: dict | None = None) -> str:
     expire = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt_expires_min)
     payload = {
         "sub": subject,
@@ -48,5 +109,6 @@ def create_access_token_v2(*, subject: str, role: str, company_id: str) -> str:
         "company_id": company_id,
         "exp": expire,
         "iat": datetime.now(timezone.utc),
+        **(claims or {}),
     }
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_alg)
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+# orjson is optional at runtime; the stdlib fallback produces equivalent compact JSON.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Compact JSON text; non-JSON types (datetime, UUID, Enum...) are stringified."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        text = obj.isoformat()
+        return text[:-6] + "Z" if text.endswith("+00:00") else text
+    if isinstance(obj, date):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """UTF-8 JSON of plain rows (dicts of column values) as Pydantic would render them:
+    ISO datetimes with `Z` for UTC, enums by value."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: orjson encoding of the already JSON-compatible content."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
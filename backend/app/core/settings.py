@@ -19,19 +19,118 @@ class Settings(BaseSettings):
     api_prefix: str = "/api/v1"
 
     database_url: str
+    # Connection pool per engine and worker: size + overflow bounds the connections one worker
+    # opens; checkouts wait up to timeout. Sizing data: GET /metrics/db-pool.
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_timeout_s: float = 30.0
+    db_pool_recycle_s: int = 1800
+    db_pool_pre_ping: bool = True
+    # Optional read replicas (JSON list or comma separated). List and history endpoints read
+    # from them unless the session already wrote or the user wrote within the window below.
+    database_replica_urls: str = ""
+    db_read_your_writes_ms: int = 2000
+
+    # List endpoints: default and maximum page size (keyset pagination, X-Next-Cursor).
+    list_page_size: int = 200
+    list_page_size_max: int = 1000
 
     jwt_secret: str
     jwt_alg: str = "HS256"
     jwt_expires_min: int = 60 * 24
 
+    # Password hashing: bcrypt cost (stored hashes with another cost are rehashed on login) and
+    # the dedicated pool running it ("thread" or "process").
+    bcrypt_rounds: int = 12
+    password_hash_executor: str = "thread"
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+
     redis_url: str = "redis://redis:6379/0"
 
+    # Realtime events: "memory" (single worker) or "redis" (Pub/Sub, required with several workers).
+    event_bus_backend: str = "memory"
+    # Bounded hand-off queue between route handlers and the bus; overflow is dropped and counted.
+    event_publish_queue_size: int = 10000
+    # WebSocket coalescing window: events within it go out as one (batched) frame.
+    ws_coalesce_ms: int = 100
+    # Per-company replay buffer (events) for clients reconnecting with ?since=<offset>.
+    event_replay_size: int = 1000
+    # Per-connection queue; a connection dropping events for longer than event_slow_consumer_s
+    # is closed (code 4409) and resumes from its last offset.
+    event_subscriber_queue_size: int = 1000
+    event_slow_consumer_s: float = 5.0
+    # Idle SSE streams get a comment line this often so proxies keep them open.
+    sse_heartbeat_s: float = 15.0
+
     # Background scheduler (incidents escalation). Disabled by default to avoid double-running in multi-worker setups.
     enable_scheduler: bool = False
     scheduler_interval_seconds: int = 60
 
+    # Audit: when enabled, routes enqueue audit intents into audit_outbox inside the request
+    # transaction and a background chainer assigns seq/hash per company.
+    audit_async: bool = False
+    audit_chainer_interval_ms: int = 200
+    audit_chainer_batch: int = 500
+    # Hash algorithm for new audit events (1 = legacy joined string, 2 = incremental + orjson).
+    audit_hash_version: int = 2
+
+    # Opt-in stateless access tokens: permission bitset + auth versions in the JWT, so GET
+    # requests skip the user lookup. Versions are re-checked at most every ttl. Off without a
+    # real Redis (a revocation would not reach other workers).
+    jwt_stateless: bool = False
+    jwt_stateless_version_ttl_ms: int = 1000
+
+    # Effective-permission cache, keyed by permission versions bumped on every change; entries
+    # also expire after ttl. Without a real Redis a bump stays in its worker: entries then live
+    # only local_ttl.
+    permissions_cache_size: int = 10000
+    permissions_cache_ttl_s: float = 60.0
+    permissions_cache_local_ttl_s: float = 5.0
+    # Also share computed permission sets between workers through Redis.
+    permissions_cache_redis: bool = False
+
+    # Read-through cache of reference data (geozones, users, driver assignments) per company,
+    # invalidated by published events. Generations are re-read from Redis at most every ttl;
+    # values are shared through Redis too when enabled. Without a real Redis an invalidation
+    # stays in its worker: entries then live only local_ttl.
+    tenant_cache_size: int = 5000
+    tenant_cache_ttl_s: float = 300.0
+    tenant_cache_local_ttl_s: float = 5.0
+    tenant_cache_redis: bool = False
+    tenant_cache_generation_ttl_ms: int = 1000
+
+    # Response compression for when the API is reached without nginx. Encodings in order of
+    # preference; br and zstd need the brotli / zstandard packages and are skipped without them.
+    compression_enabled: bool = True
+    compression_encodings: str = "zstd,br,gzip"
+    compression_min_size: int = 1024
+    compression_types: str = "application/json,application/x-ndjson,text/csv,text/plain,text/html,text/css,application/javascript"
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    compression_zstd_level: int = 3
+
     cors_origins: str = "http://localhost:8000,http://localhost:3000,http://127.0.0.1:3000"
 
+    @field_validator("database_replica_urls", mode="after")
+    @classmethod
+    def _parse_replica_urls(cls, value) -> list[str]:
+        if isinstance(value, list):
+            return value
+        raw = (value or "").strip()
+        if not raw:
+            return []
+        if raw.startswith("["):
+            return json.loads(raw)
+        return [part.strip() for part in raw.split(",") if part.strip()]
+
+    @field_validator("compression_encodings", "compression_types", mode="after")
+    @classmethod
+    def _parse_compression_lists(cls, value) -> list[str]:
+        if isinstance(value, list):
+            return value
+        return [part.strip().lower() for part in (value or "").split(",") if part.strip()]
+
     @field_validator("cors_origins", mode="after")
     @classmethod
     def _parse_cors_origins(cls, value) -> list[str]:
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Recent checkout waits kept per pool for the percentiles.
+_WAIT_SAMPLES = 2048
+
+
+def _pct(values: list[float], q: float) -> float | None:
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(q * len(values)))], 3)
+
+
+class PoolStats:
+    """Checkout counters of one pool; sync pools are used from many threads at once."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=_WAIT_SAMPLES)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.waiting = 0
+        self.max_wait_ms = 0.0
+
+    def begin(self) -> None:
+        with self._lock:
+            self.waiting += 1
+
+    def end(self, started: float, outcome: str = "ok") -> None:
+        wait_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self.waiting -= 1
+            if outcome == "timeout":
+                self.timeouts += 1
+                return
+            if outcome == "error":
+                self.errors += 1
+                return
+            self.checkouts += 1
+            self._waits.append(wait_ms)
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def snapshot(self, pool: QueuePool) -> dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._waits)
+            counters = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "errors": self.errors,
+                "waiting": self.waiting,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+        return {
+            "size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "timeout_s": pool.timeout(),
+            "checked_out": checked_out,
+            "idle": pool.checkedin(),
+            # 1.0 = every allowed connection is in use; further checkouts wait (`waiting`).
+            "saturation": round(checked_out / capacity, 3) if capacity else None,
+            **counters,
+            "wait_ms": {
+                "p50": _pct(waits, 0.50),
+                "p95": _pct(waits, 0.95),
+                "p99": _pct(waits, 0.99),
+                "samples": len(waits),
+            },
+        }
+
+
+class _MeteredPool:
+    """Times Pool.connect(): waiting for a free connection (or opening one) until handed out."""
+
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        self.stats.begin()
+        started = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.stats.end(started, "timeout")
+            raise
+        except BaseException:
+            self.stats.end(started, "error")
+            raise
+        self.stats.end(started)
+        return conn
+
+    def recreate(self):
+        # Keep the counters when the engine recreates the pool (e.g. after dispose()).
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def metrics(self) -> dict[str, Any]:
+        return self.stats.snapshot(self)
+
+
+class MeteredQueuePool(_MeteredPool, QueuePool):
+    pass
+
+
+class MeteredAsyncPool(_MeteredPool, AsyncAdaptedQueuePool):
+    pass
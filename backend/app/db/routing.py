@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import random
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+
+class RoutingSession(Session):
+    """Session reading from a replica until it writes.
+
+    Flushes, DML statements and SELECT ... FOR UPDATE go to the primary (the session's bind),
+    and every statement after the first write does too, so a request reads its own writes.
+    One replica is picked per session to keep its reads consistent.
+    """
+
+    def __init__(self, *args, replicas: list[Engine] | tuple[Engine, ...] = (), **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._replica = random.choice(replicas) if replicas else None
+
+    @property
+    def uses_replica(self) -> bool:
+        return self._replica is not None
+
+    def pin_primary(self) -> None:
+        self._replica = None
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if self._replica is None:
+            return super().get_bind(mapper, clause=clause, **kw)
+        if self._flushing or getattr(clause, "is_dml", False) or getattr(clause, "_for_update_arg", None) is not None:
+            self.pin_primary()
+            return super().get_bind(mapper, clause=clause, **kw)
+        return self._replica
@@ -1,21 +1,88 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.settings import settings
+from app.db.pool import MeteredAsyncPool, MeteredQueuePool
+from app.db.routing import RoutingSession
+from app.services.change_versions import wait_for_bumps
 
 # Handle different database types
 db_url = settings.database_url
-engine_kwargs = {}
 
-if db_url.startswith("sqlite"):
-    # SQLite doesn't support pool_pre_ping and needs check_same_thread=False
-    engine_kwargs["connect_args"] = {"check_same_thread": False}
-else:
-    # PostgreSQL and others support pool_pre_ping
-    engine_kwargs["pool_pre_ping"] = True
 
-engine = create_engine(db_url, **engine_kwargs)
+def _pool_kwargs(poolclass, url) -> dict:
+    # Each worker holds up to pool_size + max_overflow connections per engine (sync and async).
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite lives in its single connection; keep SQLAlchemy's default pool.
+        return {}
+    kwargs = {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_s,
+        "pool_recycle": settings.db_pool_recycle_s,
+    }
+    if url.get_backend_name() != "sqlite":
+        # PostgreSQL and others support pool_pre_ping
+        kwargs["pool_pre_ping"] = settings.db_pool_pre_ping
+    return kwargs
+
+
+def _create_engine(url: str):
+    u = make_url(url)
+    kwargs = _pool_kwargs(MeteredQueuePool, u)
+    if u.get_backend_name() == "sqlite":
+        # SQLite needs check_same_thread=False
+        kwargs["connect_args"] = {"check_same_thread": False}
+    return create_engine(url, **kwargs)
+
+
+engine = _create_engine(db_url)
+replica_engines = [_create_engine(url) for url in settings.database_replica_urls]
+# Sessions are cheap to create: a connection is checked out on the first query only, so
+# requests that never touch the database (cache hits, failed auth) never wait on the pool.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Read-only endpoints: replica reads, primary once the session writes (app.db.routing).
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replicas=replica_engines)
+
+
+def async_database_url(url: str) -> str:
+    """Async driver for the same database: psycopg 3 (async mode) or aiosqlite."""
+    u = make_url(url)
+    if u.get_backend_name() == "sqlite":
+        return u.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if u.get_backend_name() == "postgresql":
+        return u.set(drivername="postgresql+psycopg").render_as_string(hide_password=False)
+    return url
+
+
+def _create_async_engine(url: str):
+    return create_async_engine(async_database_url(url), **_pool_kwargs(MeteredAsyncPool, make_url(url)))
+
+
+async_engine = _create_async_engine(db_url)
+async_replica_engines = [_create_async_engine(url) for url in settings.database_replica_urls]
+# expire_on_commit=False: attributes must stay readable after commit without implicit IO.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(
+    async_engine,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    replicas=[e.sync_engine for e in async_replica_engines],
+)
+
+
+def pool_metrics() -> dict[str, dict | None]:
+    """Checkout waits and saturation of this worker's pools (None when not metered)."""
+    pools = {"sync": engine.pool, "async": async_engine.sync_engine.pool}
+    for i, e in enumerate(replica_engines):
+        pools[f"replica-{i}"] = e.pool
+    for i, e in enumerate(async_replica_engines):
+        pools[f"replica-{i}-async"] = e.sync_engine.pool
+    return {name: pool.metrics() if hasattr(pool, "metrics") else None for name, pool in pools.items()}
 
 
 def get_db():
@@ -24,3 +91,10 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+        # Versions must move before the client can revalidate against them.
+        await wait_for_bumps(db.sync_session)
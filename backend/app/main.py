@@ -1,23 +1,62 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from app.core.compression import CompressionMiddleware
+from app.core.security import PasswordHasherBusy, password_hasher
+from app.core.serialization import FastJSONResponse
 from app.core.settings import settings
 from app.api.v1.router import api_router
+from app.services.audit_outbox import run_chainer
+from app.services.events import event_bus, event_publisher
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    stop = asyncio.Event()
+    tasks: list[asyncio.Task] = []
+    await event_bus.start()
+    await event_publisher.start()
+    if settings.audit_async:
+        tasks.append(asyncio.create_task(run_chainer(stop)))
+    try:
+        yield
+    finally:
+        stop.set()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await event_publisher.stop()
+        await event_bus.stop()
+        password_hasher.shutdown()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title=settings.app_name)
+    # orjson for every JSON response; streaming and CSV routes set their own classes.
+    app = FastAPI(title=settings.app_name, lifespan=lifespan, default_response_class=FastJSONResponse)
 
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware, min_size=settings.compression_min_size, content_types=settings.compression_types
+        )
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Browsers only expose safelisted headers cross-origin; list pages carry their cursor and ETag.
+        expose_headers=["X-Next-Cursor", "ETag"],
     )
 
     app.include_router(api_router, prefix=settings.api_prefix)
 
+    @app.exception_handler(PasswordHasherBusy)
+    async def password_hasher_busy(request: Request, exc: PasswordHasherBusy):
+        return JSONResponse(status_code=503, content={"detail": "Too many sign-in attempts, retry shortly"}, headers={"Retry-After": "1"})
+
     @app.get("/health")
     def health():
         return {"status": "ok"}
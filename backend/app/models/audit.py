@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, func
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.db.base import Base
@@ -6,6 +6,14 @@ from app.db.base import Base
 
 class AuditEvent(Base):
     __tablename__ = "audit_events"
+    __table_args__ = (
+        # Keyset pagination / filters always run inside one company chain ordered by seq.
+        Index("ux_audit_company_seq", "company_id", "seq", unique=True),
+        Index("ix_audit_company_entity_seq", "company_id", "entity_type", "entity_id", "seq"),
+        Index("ix_audit_company_action_seq", "company_id", "action", "seq"),
+        Index("ix_audit_company_actor_seq", "company_id", "actor_user_id", "seq"),
+        Index("ix_audit_company_created_at", "company_id", "created_at"),
+    )
 
     id = Column(String, primary_key=True)
 
@@ -14,6 +22,8 @@ class AuditEvent(Base):
     seq = Column(Integer, nullable=False, index=True)
     prev_hash = Column(String, nullable=True)
     hash = Column(String, nullable=False, unique=True, index=True)
+    # Algorithm used for `hash`, see services.audit_chain (old rows stay on v1).
+    hash_version = Column(Integer, nullable=False, default=1, server_default="1")
 
     entity_type = Column(String, nullable=False, index=True)
     entity_id = Column(String, nullable=False, index=True)
@@ -23,3 +33,22 @@ class AuditEvent(Base):
 
     actor_user_id = Column(String, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class AuditOutbox(Base):
+    """Audit intents written in the request transaction, chained later by the background chainer."""
+
+    __tablename__ = "audit_outbox"
+    __table_args__ = (Index("ix_audit_outbox_company_created", "company_id", "created_at", "id"),)
+
+    id = Column(String, primary_key=True)
+    company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    action = Column(String, nullable=False)
+
+    payload = Column(JSONB, nullable=False, default=dict)
+
+    actor_user_id = Column(String, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
@@ -84,3 +84,6 @@ class Permission(str, enum.Enum):
     incidents_read = "incidents.read"
     incidents_write = "incidents.write"
     incidents_escalate = "incidents.escalate"
+
+    # Operations
+    metrics_read = "metrics.read"
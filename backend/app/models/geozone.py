@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Float, String, func
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Float, Index, String, func
 from sqlalchemy.dialects.postgresql import JSONB
 
 from app.db.base import Base
@@ -9,6 +9,7 @@ from app.models.enums import GeozoneEventType, GeozoneType
 
 class Geozone(Base):
     __tablename__ = "geozones"
+    __table_args__ = (Index("ix_geozones_company_created_id", "company_id", "created_at", "id"),)
 
     id = Column(String, primary_key=True)
     company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -37,6 +38,7 @@ class VehicleGeozoneState(Base):
 
 class GeozoneEvent(Base):
     __tablename__ = "geozone_events"
+    __table_args__ = (Index("ix_geozone_events_company_occurred_id", "company_id", "occurred_at", "id"),)
 
     id = Column(String, primary_key=True)
     company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, String, Text, func
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, String, Text, func
 
 from app.db.base import Base
 from app.models.enums import NotificationLevel
@@ -8,6 +8,7 @@ from app.models.enums import NotificationLevel
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (Index("ix_notifications_company_user_created_id", "company_id", "user_id", "created_at", "id"),)
 
     id = Column(String, primary_key=True)
     company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, String, Text, func
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, String, Text, func
 
 from app.db.base import Base
 from app.models.enums import OrderStatus
@@ -6,6 +6,7 @@ from app.models.enums import OrderStatus
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (Index("ix_orders_company_created_id", "company_id", "created_at", "id"),)
 
     id = Column(String, primary_key=True)
     company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Float, Integer, String, func
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Float, Index, Integer, String, func
 
 from app.db.base import Base
 
 
 class TelemetryApiKey(Base):
     __tablename__ = "telemetry_api_keys"
+    __table_args__ = (Index("ix_telemetry_api_keys_company_created_id", "company_id", "created_at", "id"),)
 
     id = Column(String, primary_key=True)
     company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
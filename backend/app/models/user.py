@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, String, func
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Index, String, func
 
 from app.db.base import Base
 from app.models.enums import UserRole
@@ -6,6 +6,7 @@ from app.models.enums import UserRole
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_company_created_id", "company_id", "created_at", "id"),)
 
     id = Column(String, primary_key=True)
     company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Float, Integer, String, func
+from sqlalchemy import Column, DateTime, ForeignKey, Float, Index, Integer, String, func
 from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import relationship
 
@@ -7,6 +7,8 @@ from app.db.base import Base
 
 class Vehicle(Base):
     __tablename__ = "vehicles"
+    # List endpoints page on (created_at, id) inside a company, see app.api.v1.pagination.
+    __table_args__ = (Index("ix_vehicles_company_created_id", "company_id", "created_at", "id"),)
 
     id = Column(String, primary_key=True)
     company_id = Column(String, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -41,6 +43,14 @@ class Vehicle(Base):
 
     health_pct = Column(Float, nullable=True)
 
+    # Last reported position and live-state version for the fleet delta stream.
+    last_lat = Column(Float, nullable=True)
+    last_lon = Column(Float, nullable=True)
+    last_speed_kph = Column(Float, nullable=True)
+    last_heading = Column(Float, nullable=True)
+    last_position_at = Column(DateTime(timezone=True), nullable=True)
+    state_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     image_url = Column(String, nullable=True)
 
     driver_profile_id = Column(String, ForeignKey("driver_profiles.id", ondelete="SET NULL"), nullable=True, index=True)
@@ -87,6 +87,10 @@ class VehicleOut(BaseModel):
     distance_done_km: float | None = None
     avg_speed: float | None = None
     health_pct: float | None = None
+    last_lat: float | None = None
+    last_lon: float | None = None
+    last_speed_kph: float | None = None
+    last_heading: float | None = None
     image_url: str | None = None
     driver_profile_id: str | None = None
     driver: DriverProfileEmbedded | None = None
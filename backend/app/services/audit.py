@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import uuid
+from datetime import datetime, timezone
 from typing import Any
 
 from sqlalchemy.orm import Session
 
+from app.core.settings import settings
+from app.models.audit import AuditOutbox
 from app.services.audit_chain import append_audit_event
 
 
@@ -17,6 +21,22 @@ def write_audit(
     actor_user_id: str | None,
     payload: dict[str, Any],
 ):
+    if settings.audit_async:
+        # Transactional outbox: the intent commits (or rolls back) with the request,
+        # seq/hash are assigned later by services.audit_outbox.
+        db.add(
+            AuditOutbox(
+                id=str(uuid.uuid4()),
+                company_id=company_id,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                action=action,
+                actor_user_id=actor_user_id,
+                payload=payload or {},
+                created_at=datetime.now(timezone.utc),
+            )
+        )
+        return
     append_audit_event(
         db,
         company_id=company_id,
@@ -6,16 +6,58 @@ import uuid
 from datetime import datetime, timezone
 from typing import Any
 
-from sqlalchemy import desc
+from sqlalchemy import desc, text
 from sqlalchemy.orm import Session
 
+from app.core.settings import settings
 from app.models.audit import AuditEvent
 
+# orjson is needed to write and verify v2 hashes; without it new events fall back to v1.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# v1: sha256 over a "|"-joined string with json.dumps(sort_keys=True) payload.
+# v2: sha256 fed field by field (length-prefixed), payload canonicalized by orjson with sorted keys.
+HASH_V1 = 1
+HASH_V2 = 2
+
+_ORJSON_OPTS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def current_hash_version() -> int:
+    version = settings.audit_hash_version
+    if version >= HASH_V2 and orjson is None:
+        return HASH_V1
+    return version
+
 
 def _stable_json(payload: dict[str, Any] | None) -> str:
     return json.dumps(payload or {}, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
 
 
+def _hash_v1(fields: list[str], payload: dict[str, Any] | None, prev_hash: str | None) -> str:
+    base = "|".join([*fields, _stable_json(payload), prev_hash or ""])
+    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+
+
+def _hash_v2(fields: list[str], payload: dict[str, Any] | None, prev_hash: str | None) -> str:
+    if orjson is None:
+        raise RuntimeError("orjson is required for audit hash v2")
+    h = hashlib.sha256()
+    chunks = [f.encode("utf-8") for f in fields]
+    chunks.append(orjson.dumps(payload or {}, option=_ORJSON_OPTS, default=str))
+    chunks.append((prev_hash or "").encode("ascii"))
+    for chunk in chunks:
+        h.update(len(chunk).to_bytes(4, "big"))
+        h.update(chunk)
+    return h.hexdigest()
+
+
+_HASHERS = {HASH_V1: _hash_v1, HASH_V2: _hash_v2}
+
+
 def compute_audit_hash(
     *,
     company_id: str,
@@ -27,43 +69,56 @@ def compute_audit_hash(
     created_at: datetime,
     payload: dict[str, Any] | None,
     prev_hash: str | None,
+    hash_version: int = HASH_V1,
 ) -> str:
-    base = "|".join(
-        [
-            company_id,
-            str(seq),
-            entity_type,
-            entity_id,
-            action,
-            actor_user_id or "",
-            created_at.astimezone(timezone.utc).isoformat(),
-            _stable_json(payload),
-            prev_hash or "",
-        ]
+    fields = [
+        company_id,
+        str(seq),
+        entity_type,
+        entity_id,
+        action,
+        actor_user_id or "",
+        created_at.astimezone(timezone.utc).isoformat(),
+    ]
+    return _HASHERS[hash_version](fields, payload, prev_hash)
+
+
+def lock_company_chain(db: Session, company_id: str) -> None:
+    """Serialize appends to one company chain until the transaction ends.
+
+    Same advisory lock as the outbox chainer (services.audit_outbox), so both writers queue
+    behind each other instead of racing for the next seq. SQLite serializes writers itself.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:k))"), {"k": f"audit:{company_id}"})
+
+
+def chain_tail(db: Session, *, company_id: str) -> tuple[int, str | None]:
+    """Return (last seq, last hash) of the company chain; (0, None) for an empty chain."""
+    last = (
+        db.query(AuditEvent.seq, AuditEvent.hash)
+        .filter(AuditEvent.company_id == company_id)
+        .order_by(desc(AuditEvent.seq))
+        .limit(1)
+        .one_or_none()
     )
-    return hashlib.sha256(base.encode("utf-8")).hexdigest()
+    return (last.seq, last.hash) if last else (0, None)
 
 
-def append_audit_event(
-    db: Session,
+def build_audit_event(
     *,
     company_id: str,
+    seq: int,
+    prev_hash: str | None,
     entity_type: str,
     entity_id: str,
     action: str,
     actor_user_id: str | None,
     payload: dict[str, Any] | None,
+    created_at: datetime,
 ) -> AuditEvent:
-    last = (
-        db.query(AuditEvent)
-        .filter(AuditEvent.company_id == company_id)
-        .order_by(desc(AuditEvent.seq))
-        .limit(1)
-        .one_or_none()
-    )
-    seq = (last.seq + 1) if last else 1
-    prev_hash = last.hash if last else None
-    created_at = datetime.now(timezone.utc)
+    hash_version = current_hash_version()
     h = compute_audit_hash(
         company_id=company_id,
         seq=seq,
@@ -74,13 +129,15 @@ def append_audit_event(
         created_at=created_at,
         payload=payload,
         prev_hash=prev_hash,
+        hash_version=hash_version,
     )
-    evt = AuditEvent(
+    return AuditEvent(
         id=str(uuid.uuid4()),
         company_id=company_id,
         seq=seq,
         prev_hash=prev_hash,
         hash=h,
+        hash_version=hash_version,
         entity_type=entity_type,
         entity_id=entity_id,
         action=action,
@@ -88,6 +145,31 @@ def append_audit_event(
         payload=payload or {},
         created_at=created_at,
     )
+
+
+def append_audit_event(
+    db: Session,
+    *,
+    company_id: str,
+    entity_type: str,
+    entity_id: str,
+    action: str,
+    actor_user_id: str | None,
+    payload: dict[str, Any] | None,
+) -> AuditEvent:
+    lock_company_chain(db, company_id)
+    last_seq, prev_hash = chain_tail(db, company_id=company_id)
+    evt = build_audit_event(
+        company_id=company_id,
+        seq=last_seq + 1,
+        prev_hash=prev_hash,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        action=action,
+        actor_user_id=actor_user_id,
+        payload=payload,
+        created_at=datetime.now(timezone.utc),
+    )
     db.add(evt)
     return evt
 
@@ -112,6 +194,7 @@ def verify_audit_chain(db: Session, *, company_id: str, limit: int = 2000) -> di
             created_at=r.created_at,
             payload=r.payload,
             prev_hash=prev,
+            hash_version=r.hash_version or HASH_V1,
         )
         if r.prev_hash != prev or r.hash != expected:
             return {
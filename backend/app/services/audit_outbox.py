@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import anyio
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+from app.models.audit import AuditOutbox
+from app.services.audit_chain import build_audit_event, chain_tail
+
+logger = logging.getLogger(__name__)
+
+
+def _try_lock_company(db: Session, company_id: str) -> bool:
+    # One chainer per company across all workers: a transaction-scoped advisory lock.
+    # Other dialects (SQLite dev setup) run a single process, nothing to coordinate.
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.execute(text("SELECT pg_try_advisory_xact_lock(hashtext(:k))"), {"k": f"audit:{company_id}"}).scalar())
+
+
+def chain_pending(db: Session, *, company_id: str, limit: int) -> int:
+    """Move up to `limit` outbox intents of one company into the hash chain. Commits."""
+    if not _try_lock_company(db, company_id):
+        db.rollback()
+        return 0
+    intents = (
+        db.query(AuditOutbox)
+        .filter(AuditOutbox.company_id == company_id)
+        .order_by(AuditOutbox.created_at.asc(), AuditOutbox.id.asc())
+        .limit(limit)
+        .all()
+    )
+    if not intents:
+        db.rollback()
+        return 0
+
+    seq, prev_hash = chain_tail(db, company_id=company_id)
+    for it in intents:
+        seq += 1
+        evt = build_audit_event(
+            company_id=company_id,
+            seq=seq,
+            prev_hash=prev_hash,
+            entity_type=it.entity_type,
+            entity_id=it.entity_id,
+            action=it.action,
+            actor_user_id=it.actor_user_id,
+            payload=it.payload,
+            created_at=it.created_at,
+        )
+        db.add(evt)
+        db.delete(it)
+        prev_hash = evt.hash
+    db.commit()
+    return len(intents)
+
+
+def run_chainer_once(limit: int | None = None) -> int:
+    limit = limit or settings.audit_chainer_batch
+    db = SessionLocal()
+    try:
+        company_ids = [r[0] for r in db.query(AuditOutbox.company_id).distinct().all()]
+        db.rollback()
+        return sum(chain_pending(db, company_id=cid, limit=limit) for cid in company_ids)
+    finally:
+        db.close()
+
+
+async def run_chainer(stop: asyncio.Event) -> None:
+    """Background loop started from the app lifespan when settings.audit_async is on."""
+    interval = settings.audit_chainer_interval_ms / 1000
+    while not stop.is_set():
+        try:
+            chained = await anyio.to_thread.run_sync(run_chainer_once)
+        except Exception:
+            logger.exception("Audit chainer iteration failed")
+            chained = 0
+        if chained:
+            continue
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.enums import Permission
+from app.models.user import User
+from app.services.permissions import auth_versions, load_effective_permissions
+from app.services.redis_client import redis_is_shared
+
+# Bit i of the permission bitset is the i-th member of Permission: new permissions are
+# appended to the enum, never inserted or reordered.
+_PERMISSIONS = list(Permission)
+_BIT_OF = {p.value: i for i, p in enumerate(_PERMISSIONS)}
+
+
+def encode_permission_bits(perms: set[str]) -> str:
+    mask = 0
+    for p in perms:
+        bit = _BIT_OF.get(p)
+        if bit is not None:
+            mask |= 1 << bit
+    return format(mask, "x")
+
+
+def decode_permission_bits(bits: str) -> set[str]:
+    mask = int(bits, 16)
+    return {p.value for i, p in enumerate(_PERMISSIONS) if mask >> i & 1}
+
+
+class _VersionCache:
+    """Short-lived per-user copy of the auth versions: the revocation check of stateless tokens.
+
+    A revoked or changed user is rejected on the fast path at most `ttl` seconds later.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 10000) -> None:
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._data: dict[str, tuple[float, tuple[int, int, int]]] = {}
+        self._lock = threading.Lock()
+
+    def cached(self, user_id: str) -> tuple[int, int, int] | None:
+        """Versions still within their TTL, without touching Redis."""
+        with self._lock:
+            hit = self._data.get(user_id)
+        if hit is not None and hit[0] > time.monotonic():
+            return hit[1]
+        return None
+
+    def get(self, user_id: str) -> tuple[int, int, int]:
+        hit = self.cached(user_id)
+        if hit is not None:
+            return hit
+        now = time.monotonic()
+        versions = auth_versions(user_id)
+        with self._lock:
+            if len(self._data) >= self._maxsize:
+                self._data.clear()
+            self._data[user_id] = (now + self._ttl, versions)
+        return versions
+
+
+version_cache = _VersionCache(settings.jwt_stateless_version_ttl_ms / 1000)
+
+
+def stateless_enabled() -> bool:
+    # On the in-memory Redis fallback a revocation bumped by one worker never reaches the others.
+    return settings.jwt_stateless and redis_is_shared()
+
+
+def stateless_claims(db: Session, user: User) -> dict:
+    """Extra access-token claims of the stateless format: permission bitset and auth versions."""
+    # Versions first: if permissions change meanwhile, the token carries the older version and
+    # simply falls back to the DB path.
+    versions = auth_versions(user.id)
+    return {"pb": encode_permission_bits(load_effective_permissions(db, user)), "pv": list(versions)}
+
+
+def stateless_versions(user_id: str) -> tuple[int, int, int] | None:
+    """Current auth versions of the user, None when stateless tokens are off or Redis fails.
+
+    Blocking (Redis) unless the versions are cached: see version_cache.cached.
+    """
+    if not stateless_enabled():
+        return None
+    try:
+        return version_cache.get(user_id)
+    except Exception:
+        return None
+
+
+def stateless_permissions(claims: dict, versions: tuple[int, int, int]) -> set[str] | None:
+    """Permission set of a stateless token stamped with `versions` (current), else None.
+
+    Versions start at the clock and a lost one is re-seeded, so tokens stamped before a Redis
+    reset never match again.
+    """
+    bits, token_versions = claims.get("pb"), claims.get("pv")
+    if bits is None or token_versions is None:
+        return None
+    try:
+        if list(versions) != list(token_versions):
+            return None
+        return decode_permission_bits(bits)
+    except Exception:
+        return None
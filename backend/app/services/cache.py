@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, TypeVar
+
+from app.core.serialization import dumps_bytes
+from app.core.settings import settings
+from app.services.events import publish_hooks
+from app.services.redis_client import get_redis, redis_is_shared
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_GENERATION_PREFIX = "cache:gen:"
+_VALUE_PREFIX = "cache:val:"
+
+# Published event types that change an entity set.
+INVALIDATING_EVENTS: dict[str, tuple[str, ...]] = {
+    "geozone.created": ("geozones",),
+    "geozone.updated": ("geozones",),
+    "geozone.deleted": ("geozones",),
+    "user.created": ("users",),
+    "user.updated": ("users",),
+    # Vehicles carry the driver assignment.
+    "vehicle.created": ("driver_profiles",),
+    "vehicle.updated": ("driver_profiles",),
+    "vehicle.deleted": ("driver_profiles",),
+}
+
+_MISSING = object()
+
+
+class TenantCache:
+    """Read-through cache of per-company entity sets: a process LRU, then optionally Redis.
+
+    Entries are keyed by (company, entity set, key) plus the set's generation. Invalidating
+    a set bumps its generation in Redis: the invalidating worker stops serving older entries
+    at once, other workers once they re-read the generation (at most every
+    `generation_ttl_ms`). Entries also expire after `ttl_s` for writes that publish no event.
+    On the in-memory Redis fallback generations are private to each worker, so entries expire
+    after `local_ttl_s` instead and nothing is shared.
+    Values shared through Redis must be JSON-serializable and come back as parsed JSON.
+    """
+
+    def __init__(self, maxsize: int, ttl_s: float, shared: bool, generation_ttl_ms: int, local_ttl_s: float) -> None:
+        self._maxsize = maxsize
+        self._ttl_s = ttl_s
+        self._local_ttl_s = local_ttl_s
+        self._shared = shared
+        self._generation_ttl_s = generation_ttl_ms / 1000
+        self._data: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._generations: dict[tuple[str, str], tuple[int, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    def _generation(self, company_id: str, entity_set: str) -> int | None:
+        now = time.monotonic()
+        known = self._generations.get((company_id, entity_set))
+        if known is not None and now - known[1] < self._generation_ttl_s:
+            return known[0]
+        try:
+            generation = int(get_redis().get(f"{_GENERATION_PREFIX}{company_id}:{entity_set}") or 0)
+        except Exception:
+            logger.exception("Cache generation unavailable, bypassing cache")
+            self.errors += 1
+            return None
+        self._generations[(company_id, entity_set)] = (generation, now)
+        return generation
+
+    def get_or_load(self, company_id: str, entity_set: str, key: str, loader: Callable[[], T], shared: bool = True) -> T:
+        """Cached value, else `loader()`; `shared=False` keeps a value (e.g. bytes) out of Redis."""
+        # Read before loading: an invalidation racing the load leaves the entry under the old generation.
+        generation = self._generation(company_id, entity_set)
+        if generation is None:
+            self.misses += 1
+            return loader()
+
+        is_shared = redis_is_shared()
+        local_key = (company_id, entity_set, generation, key)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(local_key)
+            if entry is not None and entry[0] > now:
+                self._data.move_to_end(local_key)
+                self.hits += 1
+                return entry[1]
+
+        value = _MISSING
+        shared_key = f"{_VALUE_PREFIX}{company_id}:{entity_set}:{generation}:{key}"
+        shared = shared and self._shared and is_shared
+        if shared:
+            try:
+                raw = get_redis().get(shared_key)
+            except Exception:
+                logger.exception("Shared cache read failed")
+                self.errors += 1
+                raw = None
+            if raw is not None:
+                value = json.loads(raw)
+                self.shared_hits += 1
+
+        if value is _MISSING:
+            self.misses += 1
+            value = loader()
+            if shared:
+                try:
+                    get_redis().set(shared_key, dumps_bytes(value).decode("utf-8"), ex=max(1, int(self._ttl_s)))
+                except Exception:
+                    logger.exception("Shared cache write failed")
+                    self.errors += 1
+
+        with self._lock:
+            self._data[local_key] = (now + (self._ttl_s if is_shared else self._local_ttl_s), value)
+            self._data.move_to_end(local_key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def invalidate(self, company_id: str, *entity_sets: str) -> None:
+        for entity_set in entity_sets:
+            self.invalidations += 1
+            try:
+                generation = get_redis().incr(f"{_GENERATION_PREFIX}{company_id}:{entity_set}")
+            except Exception:
+                logger.exception("Cache invalidation failed")
+                self.errors += 1
+                # Force a re-read; entries still expire after ttl_s.
+                self._generations.pop((company_id, entity_set), None)
+                continue
+            self._generations[(company_id, entity_set)] = (int(generation), time.monotonic())
+
+    def on_event(self, company_id: str, event: dict[str, Any]) -> None:
+        entity_sets = INVALIDATING_EVENTS.get(event.get("type"))
+        if entity_sets:
+            self.invalidate(company_id, *entity_sets)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.shared_hits) / lookups, 4) if lookups else None,
+            "invalidations": self.invalidations,
+            "errors": self.errors,
+        }
+
+
+tenant_cache = TenantCache(
+    settings.tenant_cache_size,
+    settings.tenant_cache_ttl_s,
+    settings.tenant_cache_redis,
+    settings.tenant_cache_generation_ttl_ms,
+    settings.tenant_cache_local_ttl_s,
+)
+publish_hooks.append(tenant_cache.on_event)
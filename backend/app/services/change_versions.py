@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from itertools import chain
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.services.redis_client import get_redis, redis_is_shared
+
+logger = logging.getLogger(__name__)
+
+# Per company and collection (table name): a counter bumped after every commit that touched
+# the collection and, with replicas configured, the epoch ms of that commit.
+_VERSION_PREFIX = "chg:ver:"
+_CHANGED_AT_PREFIX = "chg:at:"
+
+# Collections some endpoint derives a version from; commits to other tables bump nothing.
+_tracked: set[str] = set()
+
+
+def track(*collections: str) -> None:
+    _tracked.update(collections)
+
+
+def bump_change_versions(company_id: str, collections: Iterable[str]) -> None:
+    now_ms = int(time.time() * 1000)
+    r = get_redis()
+    try:
+        for collection in collections:
+            key = f"{_VERSION_PREFIX}{company_id}:{collection}"
+            # Counters start at the clock, so a reset Redis never hands out a version again.
+            r.set(key, now_ms, nx=True)
+            r.incr(key)
+            if settings.database_replica_urls:
+                window = settings.db_read_your_writes_ms
+                r.set(f"{_CHANGED_AT_PREFIX}{company_id}:{collection}", now_ms, px=window)
+    except Exception:
+        logger.exception("Failed to bump change versions")
+
+
+def change_versions(company_id: str, collections: tuple[str, ...]) -> tuple[int, ...] | None:
+    """Versions of the collections (one Redis round-trip).
+
+    None while a replica may not have the latest change yet: a version read then could be
+    paired with older rows and keep clients on them.
+    """
+    keys = [f"{_VERSION_PREFIX}{company_id}:{c}" for c in collections]
+    if settings.database_replica_urls:
+        keys += [f"{_CHANGED_AT_PREFIX}{company_id}:{c}" for c in collections]
+    values = get_redis().mget(keys)
+    versions, changed_at = values[: len(collections)], values[len(collections) :]
+    # Compared by value: the mock client keeps keys past their TTL.
+    lagging_since = time.time() * 1000 - settings.db_read_your_writes_ms
+    if any(at is not None and int(at) > lagging_since for at in changed_at):
+        return None
+    return tuple(int(v or 0) for v in versions)
+
+
+def _flushed(session: Session, flush_context) -> None:
+    changed = session.info.setdefault("changed_collections", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        company_id = getattr(obj, "company_id", None)
+        if table in _tracked and company_id:
+            changed.add((company_id, table))
+
+
+def _committed(session: Session) -> None:
+    changed = session.info.pop("changed_collections", None)
+    if not changed or not redis_is_shared():
+        # Versions in the in-memory fallback would stay private to this worker; conditional()
+        # serves no ETags then.
+        return
+    by_company: dict[str, list[str]] = {}
+    for company_id, table in changed:
+        by_company.setdefault(company_id, []).append(table)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    for company_id, tables in by_company.items():
+        if loop is None:
+            bump_change_versions(company_id, tables)
+        else:
+            # AsyncSession commit: this runs on the event loop, so the sync Redis calls go to the
+            # executor; get_async_db awaits them before the response is sent.
+            pending = session.info.setdefault("pending_bumps", [])
+            pending.append(loop.run_in_executor(None, bump_change_versions, company_id, tables))
+
+
+async def wait_for_bumps(session: Session) -> None:
+    """Wait for the version bumps of the session's async commits (see _committed)."""
+    pending = session.info.pop("pending_bumps", None)
+    if pending:
+        await asyncio.gather(*pending)
+
+
+def _rolled_back(session: Session) -> None:
+    session.info.pop("changed_collections", None)
+
+
+event.listen(Session, "after_flush", _flushed)
+event.listen(Session, "after_commit", _committed)
+event.listen(Session, "after_rollback", _rolled_back)
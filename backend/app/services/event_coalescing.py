@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from app.core.settings import settings
+from app.services.events import BusEvent, event_offset
+
+# Per-vehicle state deltas: merged into one per vehicle and window (later fields win).
+MERGED_PER_VEHICLE = {"fleet.delta"}
+# Counter summaries merged into one event per window.
+SUMMED_COUNTERS = {"telemetry.ingested": ("updated", "positions", "geozone_events")}
+
+
+def coalesce_window(raw: str | None) -> float:
+    """Per-connection window in seconds from `?coalesce_ms=` (0 = one frame per event)."""
+    try:
+        coalesce_ms = int(raw) if raw is not None else settings.ws_coalesce_ms
+    except ValueError:
+        coalesce_ms = settings.ws_coalesce_ms
+    return min(max(coalesce_ms, 0), 1000) / 1000
+
+
+def _is_coalescable(event: BusEvent) -> bool:
+    t = event.data.get("type")
+    return t in SUMMED_COUNTERS or (t in MERGED_PER_VEHICLE and "vehicle_id" in event.data)
+
+
+def coalesce(events: list[BusEvent]) -> list[BusEvent]:
+    """Merge per-vehicle deltas and counter summaries, keeping order."""
+    out: list[BusEvent | None] = []
+    latest: dict[tuple[str, str], int] = {}
+    merged_deltas: dict[int, dict[str, Any]] = {}
+    sums: dict[str, dict[str, Any]] = {}
+    sum_pos: dict[str, int] = {}
+    for evt in events:
+        t = evt.data.get("type")
+        if t in MERGED_PER_VEHICLE and "vehicle_id" in evt.data:
+            key = (t, evt.data["vehicle_id"])
+            if key in latest:
+                prev = latest[key]
+                merged_deltas[len(out)] = {**merged_deltas.pop(prev, out[prev].data), **evt.data}
+                out[prev] = None
+            latest[key] = len(out)
+            out.append(evt)
+        elif t in SUMMED_COUNTERS:
+            acc = sums.get(t)
+            if acc is None:
+                sums[t] = dict(evt.data)
+            else:
+                for field in SUMMED_COUNTERS[t]:
+                    acc[field] = acc.get(field, 0) + evt.data.get(field, 0)
+                acc["at"] = evt.data.get("at", acc.get("at"))
+                acc["offset"] = evt.data.get("offset", acc.get("offset"))
+                out[sum_pos[t]] = None
+            sum_pos[t] = len(out)
+            out.append(evt)
+        else:
+            out.append(evt)
+    for pos, merged in merged_deltas.items():
+        out[pos] = BusEvent(merged)
+    for t, pos in sum_pos.items():
+        merged = sums[t]
+        if merged != out[pos].data:
+            out[pos] = BusEvent(merged)
+    return [e for e in out if e is not None]
+
+
+def batch_frame(events: list[BusEvent]) -> str:
+    if len(events) == 1:
+        return events[0].frame
+    # Frames are already JSON; splice them instead of re-encoding.
+    return '{"type":"batch","events":[' + ",".join(e.frame for e in events) + "]}"
+
+
+async def next_events(
+    q: asyncio.Queue[BusEvent], window: float, after: int = 0, first: BusEvent | None = None
+) -> list[BusEvent]:
+    """Wait for the next event and return everything to send within `window` seconds, coalesced.
+
+    Events that cannot be coalesced (alerts, notifications...) arriving on an idle queue are sent
+    right away; otherwise the added latency is bounded by `window`. Events with offset <= `after`
+    (already sent from the replay buffer) are skipped. `first` is an event the caller already
+    took from the queue.
+    """
+    if first is None:
+        first = await q.get()
+    while after and event_offset(first) <= after:
+        first = await q.get()
+    if window <= 0 or (q.empty() and not _is_coalescable(first)):
+        return [first]
+    await asyncio.sleep(window)
+    events = [first]
+    while True:
+        try:
+            evt = q.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        if not after or event_offset(evt) > after:
+            events.append(evt)
+    return coalesce(events)
+
+
+async def next_frame(q: asyncio.Queue[BusEvent], window: float, after: int = 0) -> str:
+    """Next WebSocket frame: one event, or a batch of what arrived within `window` seconds."""
+    return batch_frame(await next_events(q, window, after))
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from anyio import to_thread
+from jose import jwt
+from starlette.requests import HTTPConnection
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+from app.models.enums import UserRole
+from app.models.user import User
+from app.services.events import BusEvent, SubscriptionFilter, event_bus, event_offset
+from app.services.reference_data import driver_vehicle_ids
+
+_MAX_TOPICS = 500
+
+
+class StreamPrincipal:
+    """Who is listening: drivers are limited to the vehicles assigned to them."""
+
+    __slots__ = ("user_id", "company_id", "role", "vehicle_ids")
+
+    def __init__(self, user_id: str, company_id: str, role: UserRole, vehicle_ids: set[str] | None) -> None:
+        self.user_id = user_id
+        self.company_id = company_id
+        self.role = role
+        self.vehicle_ids = vehicle_ids
+
+
+def _split(value: Any) -> set[str] | None:
+    if value is None:
+        return None
+    items = value.split(",") if isinstance(value, str) else list(value)
+    topics = {str(v).strip() for v in items if str(v).strip()}
+    if len(topics) > _MAX_TOPICS:
+        raise ValueError(f"too many topics (max {_MAX_TOPICS})")
+    return topics or None
+
+
+def _bbox(value: Any) -> tuple[float, float, float, float] | None:
+    if value is None or value == "":
+        return None
+    parts = value.split(",") if isinstance(value, str) else list(value)
+    if len(parts) != 4:
+        raise ValueError("bbox must be min_lon,min_lat,max_lon,max_lat")
+    min_lon, min_lat, max_lon, max_lat = (float(p) for p in parts)
+    if min_lon > max_lon or min_lat > max_lat:
+        raise ValueError("bbox min must not exceed max")
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def parse_filter(params: Mapping[str, Any]) -> tuple[set[str] | None, set[str] | None, tuple | None]:
+    """Read `vehicles`, `types` and `bbox` from query params or a subscribe message.
+
+    Lists may be given as comma separated strings or JSON arrays. Raises ValueError on bad input.
+    """
+    return _split(params.get("vehicles")), _split(params.get("types")), _bbox(params.get("bbox"))
+
+
+def build_filter(
+    principal: StreamPrincipal,
+    vehicle_ids: set[str] | None,
+    types: set[str] | None,
+    bbox: tuple | None,
+) -> SubscriptionFilter | None:
+    if principal.vehicle_ids is not None:
+        # Drivers never see other vehicles, whatever they ask for.
+        vehicle_ids = principal.vehicle_ids if vehicle_ids is None else vehicle_ids & principal.vehicle_ids
+        return SubscriptionFilter(vehicle_ids=vehicle_ids, types=types, bbox=bbox, user_id=principal.user_id)
+    if vehicle_ids is None and types is None and bbox is None:
+        return None
+    return SubscriptionFilter(vehicle_ids=vehicle_ids, types=types, bbox=bbox, user_id=principal.user_id)
+
+
+def _load_principal(user_id: str, company_id: str) -> StreamPrincipal | None:
+    db = SessionLocal()
+    try:
+        user = db.get(User, user_id)
+        if not user or not user.is_active or user.company_id != company_id:
+            return None
+        vehicle_ids = None
+        if user.role == UserRole.driver:
+            vehicle_ids = set(driver_vehicle_ids(db, company_id, user.id))
+        return StreamPrincipal(user.id, company_id, user.role, vehicle_ids)
+    finally:
+        db.close()
+
+
+async def resolve_stream_principal(user_id: str, company_id: str) -> StreamPrincipal | None:
+    return await to_thread.run_sync(_load_principal, user_id, company_id)
+
+
+def connection_info(conn: HTTPConnection, principal: StreamPrincipal) -> dict[str, Any]:
+    """Labels of a subscriber shown by the connections metrics endpoint."""
+    client = f"{conn.client.host}:{conn.client.port}" if conn.client else None
+    return {"channel": conn.url.path, "user_id": principal.user_id, "role": principal.role.value, "client": client}
+
+
+def _extract_token(conn: HTTPConnection) -> str | None:
+    # Prefer query param: browser WebSocket and EventSource cannot set headers.
+    token = conn.query_params.get("token")
+    if token:
+        return token
+    auth = conn.headers.get("authorization")
+    if auth and auth.lower().startswith("bearer "):
+        return auth.split(" ", 1)[1]
+    return None
+
+
+async def authenticate_stream(conn: HTTPConnection) -> StreamPrincipal | None:
+    """Principal of a realtime connection (WebSocket or SSE) from its access token."""
+    token = _extract_token(conn)
+    if not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_alg])
+    except Exception:
+        return None
+    company_id = payload.get("company_id")
+    user_id = payload.get("sub")
+    if not company_id or not user_id:
+        return None
+    return await resolve_stream_principal(user_id, company_id)
+
+
+async def replay_since(
+    company_id: str, since: int, flt: SubscriptionFilter | None
+) -> tuple[list[BusEvent], int]:
+    """Missed events after `since` visible to `flt`, plus the last offset the replay covered.
+
+    Live events up to that offset may also sit in the subscriber queue (it was subscribed before
+    the replay was read) and must be skipped. Raises ReplayGap when the client has to resync.
+    """
+    events = await event_bus.replay(company_id, since)
+    covered = event_offset(events[-1]) if events else since
+    if flt is not None:
+        events = [e for e in events if flt.matches(e.data)]
+    return events, covered
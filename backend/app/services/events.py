@@ -1,58 +1,564 @@
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict
-from typing import Any
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from typing import Any, Callable
 
-import anyio
+from app.core.serialization import dumps
+from app.core.settings import settings
 
+logger = logging.getLogger(__name__)
 
-class EventBus:
-    """In-memory per-process event bus.
 
-    For production horizontal scaling, replace with Redis PubSub.
+class BusEvent:
+    """Event as it travels through the bus: the dict plus its JSON frame, encoded once."""
+
+    __slots__ = ("data", "frame")
+
+    def __init__(self, data: dict[str, Any], frame: str | None = None) -> None:
+        self.data = data
+        self.frame = frame if frame is not None else dumps(data)
+
+
+def event_offset(event: BusEvent) -> int:
+    return event.data.get("offset") or 0
+
+
+class ReplayGap(Exception):
+    """The requested offset is no longer (or not yet) in the replay buffer; the client must resync."""
+
+    def __init__(self, since: int, oldest: int, latest: int) -> None:
+        super().__init__(f"offset {since} outside replay window {oldest}..{latest}")
+        self.since = since
+        self.oldest = oldest
+        self.latest = latest
+
+
+class Subscriber(asyncio.Queue):
+    """Event queue of one connection plus the counters used to spot slow consumers.
+
+    A subscriber that keeps dropping events (queue full) for longer than the slow-consumer
+    limit gets `evicted` set; its transport then closes the connection and the client resumes
+    from its last offset.
+    """
+
+    def __init__(self, maxsize: int, info: dict[str, Any] | None = None) -> None:
+        super().__init__(maxsize=maxsize)
+        self.info = info or {}
+        self.connected_at = time.time()
+        self.enqueued = 0
+        self.dropped = 0
+        self.last_offset = 0
+        self.lagging_since: float | None = None
+        self.evicted = asyncio.Event()
+
+    def stats(self) -> dict[str, Any]:
+        lag = self.qsize()
+        return {
+            **self.info,
+            "connected_at": self.connected_at,
+            "lag": lag,
+            "delivered": self.enqueued - self.dropped - lag,
+            "dropped": self.dropped,
+            "last_offset": self.last_offset,
+            "lagging_for_s": round(time.monotonic() - self.lagging_since, 3) if self.lagging_since is not None else 0.0,
+            "evicted": self.evicted.is_set(),
+        }
+
+
+class SubscriptionFilter:
+    """Server-side topic filter of one subscriber. `None` dimensions match everything.
+
+    - vehicle_ids: only events about these vehicles; events without `vehicle_id` pass only when
+      addressed to `user_id` (e.g. notification.created).
+    - types: only these event types.
+    - bbox: (min_lon, min_lat, max_lon, max_lat); applies to events carrying lat/lon.
+    """
+
+    __slots__ = ("vehicle_ids", "types", "bbox", "user_id")
+
+    def __init__(
+        self,
+        *,
+        vehicle_ids: set[str] | None = None,
+        types: set[str] | None = None,
+        bbox: tuple[float, float, float, float] | None = None,
+        user_id: str | None = None,
+    ) -> None:
+        self.vehicle_ids = vehicle_ids
+        self.types = types
+        self.bbox = bbox
+        self.user_id = user_id
+
+    def matches(self, data: dict[str, Any]) -> bool:
+        if self.types is not None and data.get("type") not in self.types:
+            return False
+        if self.vehicle_ids is not None:
+            vehicle_id = data.get("vehicle_id")
+            if vehicle_id is None:
+                if self.user_id is None or data.get("user_id") != self.user_id:
+                    return False
+            elif vehicle_id not in self.vehicle_ids:
+                return False
+        if self.bbox is not None:
+            lat, lon = data.get("lat"), data.get("lon")
+            if lat is not None and lon is not None:
+                min_lon, min_lat, max_lon, max_lat = self.bbox
+                if not (min_lon <= lon <= max_lon and min_lat <= lat <= max_lat):
+                    return False
+        return True
+
+
+class _CompanySubscribers:
+    """Subscribers of one company indexed by topic.
+
+    Each queue sits in exactly one bucket: by vehicle (and by user) when it filters on vehicles,
+    else by type when it filters on types, else in `wildcard`. Fan-out only visits the buckets
+    an event can match and then applies the full filter.
     """
 
+    __slots__ = ("filters", "wildcard", "by_vehicle", "by_user", "by_type")
+
     def __init__(self) -> None:
-        self._subscribers: dict[str, set[asyncio.Queue[dict[str, Any]]]] = defaultdict(set)
+        self.filters: dict[Subscriber, SubscriptionFilter | None] = {}
+        self.wildcard: set[Subscriber] = set()
+        self.by_vehicle: dict[str, set[Subscriber]] = defaultdict(set)
+        self.by_user: dict[str, set[Subscriber]] = defaultdict(set)
+        self.by_type: dict[str, set[Subscriber]] = defaultdict(set)
+
+    def _buckets(self, flt: SubscriptionFilter | None) -> list[tuple[dict[str, set] | None, str | None]]:
+        if flt is not None and flt.vehicle_ids is not None:
+            buckets = [(self.by_vehicle, vid) for vid in flt.vehicle_ids]
+            if flt.user_id is not None:
+                buckets.append((self.by_user, flt.user_id))
+            return buckets
+        if flt is not None and flt.types is not None:
+            return [(self.by_type, t) for t in flt.types]
+        return [(None, None)]
+
+    def add(self, q: Subscriber, flt: SubscriptionFilter | None) -> None:
+        self.filters[q] = flt
+        for index, key in self._buckets(flt):
+            if index is None:
+                self.wildcard.add(q)
+            else:
+                index[key].add(q)
+
+    def remove(self, q: Subscriber) -> None:
+        flt = self.filters.pop(q, None)
+        for index, key in self._buckets(flt):
+            if index is None:
+                self.wildcard.discard(q)
+                continue
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(q)
+                if not bucket:
+                    index.pop(key, None)
+
+    def candidates(self, data: dict[str, Any]):
+        yield from self.wildcard
+        vehicle_id = data.get("vehicle_id")
+        if vehicle_id is not None:
+            yield from self.by_vehicle.get(vehicle_id, ())
+        else:
+            user_id = data.get("user_id")
+            if user_id is not None:
+                yield from self.by_user.get(user_id, ())
+        yield from self.by_type.get(data.get("type"), ())
+
+
+class EventBus(ABC):
+    """Per-process subscriber registry with local fan-out to asyncio queues.
+
+    Backends only differ in how a published event reaches `_fanout` of every worker.
+    """
+
+    def __init__(self, replay_size: int = 1000, queue_size: int = 1000, slow_consumer_s: float = 5.0) -> None:
+        self._subscribers: dict[str, _CompanySubscribers] = {}
+        self._replay_size = replay_size
+        self._queue_size = queue_size
+        self._slow_consumer_s = slow_consumer_s
+        # Local offsets and replay buffers (the only source for the in-memory bus).
+        self._offsets: dict[str, int] = defaultdict(int)
+        self._replay: dict[str, deque[BusEvent]] = {}
 
-    def subscribe(self, company_id: str) -> asyncio.Queue[dict[str, Any]]:
-        q: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=1000)
-        self._subscribers[company_id].add(q)
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def subscribe(
+        self, company_id: str, flt: SubscriptionFilter | None = None, info: dict[str, Any] | None = None
+    ) -> Subscriber:
+        q = Subscriber(self._queue_size, info)
+        self._subscribers.setdefault(company_id, _CompanySubscribers()).add(q, flt)
         return q
 
-    def unsubscribe(self, company_id: str, q: asyncio.Queue[dict[str, Any]]) -> None:
-        self._subscribers[company_id].discard(q)
-        if not self._subscribers[company_id]:
+    async def update_filter(self, company_id: str, q: Subscriber, flt: SubscriptionFilter | None) -> None:
+        subs = self._subscribers.get(company_id)
+        if subs is None or q not in subs.filters:
+            return
+        subs.remove(q)
+        subs.add(q, flt)
+
+    async def unsubscribe(self, company_id: str, q: Subscriber) -> None:
+        subs = self._subscribers.get(company_id)
+        if subs is None:
+            return
+        subs.remove(q)
+        if not subs.filters:
             self._subscribers.pop(company_id, None)
 
+    @abstractmethod
+    async def publish(self, company_id: str, event: dict[str, Any]) -> None:
+        """Stamp the event with the company's next offset and deliver it to every worker."""
+
+    async def latest_offset(self, company_id: str) -> int:
+        return self._offsets.get(company_id, 0)
+
+    async def replay(self, company_id: str, since: int) -> list[BusEvent]:
+        """Events with offset > `since`, oldest first. Raises ReplayGap if some were evicted."""
+        return self._replay_local(company_id, since)
+
+    def _stamp_local(self, company_id: str, event: dict[str, Any]) -> BusEvent:
+        self._offsets[company_id] += 1
+        evt = BusEvent({"offset": self._offsets[company_id], **event})
+        buf = self._replay.get(company_id)
+        if buf is None:
+            buf = self._replay[company_id] = deque(maxlen=self._replay_size)
+        buf.append(evt)
+        return evt
+
+    def _replay_local(self, company_id: str, since: int) -> list[BusEvent]:
+        latest = self._offsets.get(company_id, 0)
+        buf = self._replay.get(company_id) or ()
+        oldest = event_offset(buf[0]) if buf else latest + 1
+        # since > latest: offsets were reset (restart) since the client last saw them.
+        if since > latest or since + 1 < oldest:
+            raise ReplayGap(since, oldest, latest)
+        return [e for e in buf if event_offset(e) > since]
+
+    def _fanout(self, company_id: str, event: BusEvent) -> None:
+        subs = self._subscribers.get(company_id)
+        if subs is None:
+            return
+        for q in subs.candidates(event.data):
+            flt = subs.filters[q]
+            if flt is not None and not flt.matches(event.data):
+                continue
+            self._deliver(q, event)
+
+    def _deliver(self, q: Subscriber, event: BusEvent) -> None:
+        q.enqueued += 1
+        q.last_offset = event.data.get("offset") or q.last_offset
+        try:
+            q.put_nowait(event)
+        except asyncio.QueueFull:
+            pass
+        else:
+            if q.lagging_since is not None and q.qsize() < q.maxsize // 2:
+                q.lagging_since = None
+            return
+        # Drop oldest style behavior: if consumer is slow, we skip to protect server.
+        try:
+            _ = q.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        q.put_nowait(event)
+        q.dropped += 1
+        now = time.monotonic()
+        if q.lagging_since is None:
+            q.lagging_since = now
+        elif now - q.lagging_since >= self._slow_consumer_s and not q.evicted.is_set():
+            logger.warning(f"Evicting slow event consumer {q.info} (dropped={q.dropped}, lag={q.qsize()})")
+            q.evicted.set()
+
+    def connections(self, company_id: str) -> list[dict[str, Any]]:
+        """Local subscribers of a company, most lagging first."""
+        subs = self._subscribers.get(company_id)
+        if subs is None:
+            return []
+        return sorted((q.stats() for q in subs.filters), key=lambda st: (st["lag"], st["dropped"]), reverse=True)
+
+
+class InMemoryEventBus(EventBus):
+    """Single-process bus: subscribers only see events published by the same worker."""
+
     async def publish(self, company_id: str, event: dict[str, Any]) -> None:
-        queues = list(self._subscribers.get(company_id, ()))
-        for q in queues:
+        self._fanout(company_id, self._stamp_local(company_id, event))
+
+
+class RedisEventBus(EventBus):
+    """Cross-worker bus over Redis Pub/Sub.
+
+    One shared subscriber connection per worker, one channel per company. A channel is
+    subscribed while the worker has at least one local subscriber for that company; a single
+    reader task fans messages out to the local queues.
+
+    Offsets come from a per-company counter; each event is also appended to a capped Redis
+    Stream (entry id `<offset>-0`) that serves replays. Counter, stream append and publish run
+    in one Lua script, so offsets reach every worker in order.
+
+    If Redis is unreachable at start the bus delivers in-process and keeps retrying in the
+    background; once connected, clients resuming from local offsets get a ReplayGap and resync.
+    """
+
+    channel_prefix = "events:"
+    # Keeps the pubsub connection open while no company channel is subscribed.
+    control_channel = "events:__worker__"
+    offset_prefix = "events-offset:"
+    stream_prefix = "events-stream:"
+    reconnect_interval_s = 5.0
+
+    # Splices the offset into the pre-encoded frame: '{"offset":N,' + frame[1:].
+    _PUBLISH_SCRIPT = """
+local offset = redis.call('INCR', KEYS[1])
+local frame = '{"offset":' .. offset .. ',' .. string.sub(ARGV[1], 2)
+redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], offset .. '-0', 'f', frame)
+redis.call('PUBLISH', KEYS[3], frame)
+return offset
+"""
+
+    def __init__(self, url: str, **options: Any) -> None:
+        super().__init__(**options)
+        self._url = url
+        self._redis = None
+        self._pubsub = None
+        self._reader: asyncio.Task | None = None
+        self._connector: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        try:
+            await self._connect()
+        except Exception as e:
+            # Same fallback policy as services.redis_client: degrade to in-process delivery.
+            logger.warning(
+                f"Redis not available for events ({e}). Delivering in-process only, "
+                f"retrying every {self.reconnect_interval_s:g}s."
+            )
+            self._connector = asyncio.create_task(self._reconnect_loop())
+
+    async def _connect(self) -> None:
+        from redis.asyncio import Redis
+
+        client = Redis.from_url(self._url, decode_responses=True)
+        try:
+            await client.ping()
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self.control_channel, *(self.channel_prefix + c for c in self._subscribers))
+        except BaseException:
+            await client.aclose()
+            raise
+        self._pubsub = pubsub
+        # Companies that got their first local subscriber while subscribing above.
+        missed = [self.channel_prefix + c for c in self._subscribers if self.channel_prefix + c not in pubsub.channels]
+        if missed:
+            await pubsub.subscribe(*missed)
+        self._publish_script = client.register_script(self._PUBLISH_SCRIPT)
+        self._reader = asyncio.create_task(self._read_loop())
+        # Publishing through Redis only once this worker reads the channels back.
+        self._redis = client
+
+    async def _reconnect_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconnect_interval_s)
             try:
-                q.put_nowait(event)
-            except asyncio.QueueFull:
-                # Drop oldest style behavior: if consumer is slow, we skip to protect server.
-                try:
-                    _ = q.get_nowait()
-                except asyncio.QueueEmpty:
-                    pass
-                try:
-                    q.put_nowait(event)
-                except asyncio.QueueFull:
-                    pass
+                await self._connect()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Redis still not available for events ({e})")
+                continue
+            logger.info("Redis available for events again, delivering across workers")
+            self._connector = None
+            return
 
+    async def stop(self) -> None:
+        for task in (self._connector, self._reader):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        if self._pubsub:
+            await self._pubsub.aclose()
+        if self._redis:
+            await self._redis.aclose()
 
-def publish_event(company_id: str, event: dict[str, Any]) -> None:
-    """Publish from sync or async contexts."""
+    async def subscribe(
+        self, company_id: str, flt: SubscriptionFilter | None = None, info: dict[str, Any] | None = None
+    ) -> Subscriber:
+        first = company_id not in self._subscribers
+        q = await super().subscribe(company_id, flt, info)
+        if first and self._pubsub is not None:
+            await self._pubsub.subscribe(self.channel_prefix + company_id)
+        return q
+
+    async def unsubscribe(self, company_id: str, q: Subscriber) -> None:
+        await super().unsubscribe(company_id, q)
+        if company_id not in self._subscribers and self._pubsub is not None:
+            await self._pubsub.unsubscribe(self.channel_prefix + company_id)
+
+    async def publish(self, company_id: str, event: dict[str, Any]) -> None:
+        if self._redis is None:
+            self._fanout(company_id, self._stamp_local(company_id, event))
+            return
+        try:
+            await self._publish_script(
+                keys=[self.offset_prefix + company_id, self.stream_prefix + company_id, self.channel_prefix + company_id],
+                args=[dumps(event), self._replay_size],
+            )
+        except Exception:
+            # Keep local subscribers working when Redis is down.
+            logger.exception("Redis publish failed, delivering locally only")
+            self._fanout(company_id, self._stamp_local(company_id, event))
+
+    async def latest_offset(self, company_id: str) -> int:
+        if self._redis is None:
+            return await super().latest_offset(company_id)
+        return int(await self._redis.get(self.offset_prefix + company_id) or 0)
 
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        # Running in threadpool context
-        anyio.from_thread.run(event_bus.publish, company_id, event)
-        return
-    loop.create_task(event_bus.publish(company_id, event))
+    async def replay(self, company_id: str, since: int) -> list[BusEvent]:
+        if self._redis is None:
+            return self._replay_local(company_id, since)
+        stream = self.stream_prefix + company_id
+        latest = await self.latest_offset(company_id)
+        head = await self._redis.xrange(stream, min="-", max="+", count=1)
+        oldest = int(head[0][0].split("-", 1)[0]) if head else latest + 1
+        if since > latest or since + 1 < oldest:
+            raise ReplayGap(since, oldest, latest)
+        if since == latest:
+            return []
+        entries = await self._redis.xrange(stream, min=f"{since + 1}-0", max="+", count=self._replay_size)
+        return [BusEvent(json.loads(fields["f"]), frame=fields["f"]) for _, fields in entries]
+
+    async def _read_loop(self) -> None:
+        while True:
+            try:
+                msg = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Redis event reader failed, retrying")
+                await asyncio.sleep(1.0)
+                continue
+            if not msg or msg.get("type") != "message":
+                continue
+            channel = msg["channel"]
+            if not channel.startswith(self.channel_prefix) or channel == self.control_channel:
+                continue
+            try:
+                # The published text already is the frame; parse once per worker for the dict.
+                event = BusEvent(json.loads(msg["data"]), frame=msg["data"])
+            except ValueError:
+                continue
+            self._fanout(channel[len(self.channel_prefix) :], event)
+
+
+def create_event_bus() -> EventBus:
+    options = {
+        "replay_size": settings.event_replay_size,
+        "queue_size": settings.event_subscriber_queue_size,
+        "slow_consumer_s": settings.event_slow_consumer_s,
+    }
+    if settings.event_bus_backend == "redis":
+        return RedisEventBus(settings.redis_url, **options)
+    return InMemoryEventBus(**options)
+
+
+class EventPublisher:
+    """Hands events from route handlers to the bus without blocking the caller.
+
+    Sync handlers run in the threadpool; instead of waiting for the event loop to run
+    `bus.publish`, they schedule a non-blocking put into a bounded queue with
+    `call_soon_threadsafe`. One loop task drains the queue into the bus. When the queue is
+    full the event is dropped and counted.
+    """
+
+    def __init__(self, bus: EventBus, maxsize: int) -> None:
+        self._bus = bus
+        self._maxsize = maxsize
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[tuple[str, dict[str, Any]]] | None = None
+        self._task: asyncio.Task | None = None
+        self.published = 0
+        self.dropped = 0
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self._maxsize)
+        self._task = asyncio.create_task(self._drain())
+
+    async def stop(self, timeout: float = 2.0) -> None:
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        self._loop = None
+
+    def publish(self, company_id: str, event: dict[str, Any]) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            self.dropped += 1
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._offer((company_id, event))
+        else:
+            loop.call_soon_threadsafe(self._offer, (company_id, event))
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "published": self.published,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    def _offer(self, item: tuple[str, dict[str, Any]]) -> None:
+        try:
+            self._queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Event publish queue full, dropped {self.dropped} events so far")
+
+    async def _drain(self) -> None:
+        while True:
+            company_id, event = await self._queue.get()
+            try:
+                await self._bus.publish(company_id, event)
+                self.published += 1
+            except Exception:
+                logger.exception("Event publish failed")
+            finally:
+                self._queue.task_done()
+
+
+# Run synchronously in the publishing worker before the event is queued (cache invalidation).
+publish_hooks: list[Callable[[str, dict[str, Any]], None]] = []
+
+
+def publish_event(company_id: str, event: dict[str, Any]) -> None:
+    """Publish from sync or async contexts. Never blocks; see EventPublisher."""
+    for hook in publish_hooks:
+        try:
+            hook(company_id, event)
+        except Exception:
+            logger.exception("Publish hook failed")
+    event_publisher.publish(company_id, event)
 
 
-event_bus = EventBus()
+event_bus = create_event_bus()
+event_publisher = EventPublisher(event_bus, maxsize=settings.event_publish_queue_size)
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any
+
+from anyio import to_thread
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models.geozone import Geozone, VehicleGeozoneState
+from app.models.vehicle import Vehicle
+from app.services.events import SubscriptionFilter
+
+DELTA_TYPE = "fleet.delta"
+
+# Live-state field -> Vehicle column.
+STATE_COLUMNS = {
+    "lat": "last_lat",
+    "lon": "last_lon",
+    "speed_kph": "last_speed_kph",
+    "heading": "last_heading",
+    "avg_speed": "avg_speed",
+    "fuel_pct": "fuel_pct",
+    "load_pct": "load_pct",
+    "health_pct": "health_pct",
+}
+
+
+def vehicle_state(v: Vehicle) -> dict[str, Any]:
+    return {field: getattr(v, column) for field, column in STATE_COLUMNS.items()}
+
+
+def changed_fields(before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+    return {k: value for k, value in after.items() if before.get(k) != value}
+
+
+def fleet_delta(v: Vehicle, changed: dict[str, Any], at: str) -> dict[str, Any]:
+    """Delta event for the fleet stream; `v` is the vehicle's state version after the change."""
+    return {"type": DELTA_TYPE, "vehicle_id": v.id, "v": v.state_version, **changed, "at": at}
+
+
+def _load_snapshot(company_id: str, flt: SubscriptionFilter | None) -> list[dict[str, Any]]:
+    db = SessionLocal()
+    try:
+        stmt = select(Vehicle.id, Vehicle.state_version, *(getattr(Vehicle, c) for c in STATE_COLUMNS.values())).where(
+            Vehicle.company_id == company_id
+        )
+        if flt is not None and flt.vehicle_ids is not None:
+            stmt = stmt.where(Vehicle.id.in_(flt.vehicle_ids))
+        rows = db.execute(stmt).all()
+
+        zones: dict[str, list[str]] = {}
+        inside = db.execute(
+            select(VehicleGeozoneState.vehicle_id, VehicleGeozoneState.geozone_id)
+            .join(Geozone, Geozone.id == VehicleGeozoneState.geozone_id)
+            .where(Geozone.company_id == company_id, Geozone.is_active.is_(True), VehicleGeozoneState.is_inside.is_(True))
+        ).all()
+        for vehicle_id, geozone_id in inside:
+            zones.setdefault(vehicle_id, []).append(geozone_id)
+    finally:
+        db.close()
+
+    out = []
+    for row in rows:
+        item = {"vehicle_id": row[0], "v": row[1], **dict(zip(STATE_COLUMNS, row[2:]))}
+        item["zones"] = sorted(zones.get(row[0], ()))
+        if flt is None or flt.matches({"type": DELTA_TYPE, **item}):
+            out.append(item)
+    return out
+
+
+async def load_snapshot(company_id: str, flt: SubscriptionFilter | None) -> list[dict[str, Any]]:
+    """Current state of every vehicle visible to `flt` (vehicle ids and bbox apply)."""
+    return await to_thread.run_sync(_load_snapshot, company_id, flt)
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
 from functools import lru_cache
 from typing import Iterable
 
 from sqlalchemy.orm import Session
 
+from app.core.settings import settings
 from app.models.enums import Permission, UserRole
 from app.models.permission import RolePermission, UserPermissionOverride
 from app.models.user import User
+from app.services.redis_client import get_redis, redis_is_shared
+
+logger = logging.getLogger(__name__)
+
+# Role permissions are global, overrides are per user: one version counter for each. Counters
+# start at the clock (ms) when first read or bumped, so a reset Redis never hands out a version
+# some cache entry or token was stamped with before.
+_ROLE_VERSION_KEY = "perm:ver:roles"
+_USER_VERSION_PREFIX = "perm:ver:user:"
+# Bumped when a user's role or active flag changes (invalidates stateless tokens).
+_USER_STATE_PREFIX = "auth:ver:user:"
+_SHARED_PREFIX = "perm:eff:"
+_SHARED_TTL_S = 3600
 
 
 @lru_cache(maxsize=32)
@@ -33,6 +52,7 @@ def default_role_permissions() -> dict[UserRole, set[str]]:
             Permission.incidents_read.value,
             Permission.incidents_write.value,
             Permission.incidents_escalate.value,
+            Permission.metrics_read.value,
         },
         UserRole.driver: {
             Permission.vehicles_read.value,
@@ -45,7 +65,133 @@ def default_role_permissions() -> dict[UserRole, set[str]]:
     }
 
 
+class _PermissionCache:
+    """Thread-safe LRU of effective permission sets (sync handlers run in the threadpool).
+
+    Entries expire after `ttl_s` even when no version moved (e.g. a bump lost while Redis was down).
+    """
+
+    def __init__(self, maxsize: int, ttl_s: float) -> None:
+        self._maxsize = maxsize
+        self._ttl_s = ttl_s
+        self._data: OrderedDict[tuple, tuple[float, frozenset[str]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> frozenset[str] | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: tuple, perms: frozenset[str], ttl_s: float | None = None) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + (self._ttl_s if ttl_s is None else ttl_s), perms)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+permission_cache = _PermissionCache(settings.permissions_cache_size, settings.permissions_cache_ttl_s)
+
+
+def _read_versions(keys: list[str]) -> tuple[int, ...]:
+    r = get_redis()
+    values = r.mget(keys)
+    missing = [k for k, v in zip(keys, values) if v is None]
+    if missing:
+        now_ms = int(time.time() * 1000)
+        for key in missing:
+            r.set(key, now_ms, nx=True)
+        values = r.mget(keys)
+    return tuple(int(v) for v in values)
+
+
+def _bump_version(key: str) -> None:
+    r = get_redis()
+    r.set(key, int(time.time() * 1000), nx=True)
+    r.incr(key)
+
+
+def permission_versions(user_id: str) -> tuple[int, int]:
+    """(role permissions version, user overrides version); one Redis round-trip once seeded."""
+    return _read_versions([_ROLE_VERSION_KEY, _USER_VERSION_PREFIX + user_id])
+
+
+def auth_versions(user_id: str) -> tuple[int, int, int]:
+    """(role permissions, user overrides, user state) versions; one Redis round-trip once seeded."""
+    return _read_versions([_ROLE_VERSION_KEY, _USER_VERSION_PREFIX + user_id, _USER_STATE_PREFIX + user_id])
+
+
+def bump_user_state_version(user_id: str) -> None:
+    try:
+        _bump_version(_USER_STATE_PREFIX + user_id)
+    except Exception:
+        logger.exception("Failed to bump user state version")
+
+
+def bump_role_permissions_version() -> None:
+    # Call after commit: a request racing the write could otherwise cache the old set under the new version.
+    try:
+        _bump_version(_ROLE_VERSION_KEY)
+    except Exception:
+        logger.exception("Failed to bump role permissions version")
+
+
+def bump_user_permissions_version(user_id: str) -> None:
+    try:
+        _bump_version(_USER_VERSION_PREFIX + user_id)
+    except Exception:
+        logger.exception("Failed to bump user permissions version")
+
+
 def get_effective_permissions(db: Session, user: User) -> set[str]:
+    # On the in-memory Redis fallback a version bump reaches this worker only: the others serve
+    # their entries until the short local TTL, and nothing is shared.
+    shared = redis_is_shared()
+    share_sets = shared and settings.permissions_cache_redis
+    try:
+        versions = permission_versions(user.id)
+    except Exception:
+        # Without a version we cannot tell whether a cached set is current.
+        logger.exception("Permission versions unavailable, loading from DB")
+        return load_effective_permissions(db, user)
+
+    key = (user.id, UserRole(user.role).value, *versions)
+    perms = permission_cache.get(key)
+    if perms is not None:
+        return set(perms)
+
+    shared_key = _SHARED_PREFIX + ":".join(str(k) for k in key)
+    if share_sets:
+        try:
+            raw = get_redis().get(shared_key)
+        except Exception:
+            raw = None
+        if raw:
+            perms = frozenset(json.loads(raw))
+            permission_cache.put(key, perms)
+            return set(perms)
+
+    loaded = load_effective_permissions(db, user)
+    permission_cache.put(key, frozenset(loaded), None if shared else settings.permissions_cache_local_ttl_s)
+    if share_sets:
+        try:
+            get_redis().set(shared_key, json.dumps(sorted(loaded)), ex=_SHARED_TTL_S)
+        except Exception:
+            logger.exception("Failed to share effective permissions")
+    return loaded
+
+
+def load_effective_permissions(db: Session, user: User) -> set[str]:
     role = UserRole(user.role)
     perms = set(default_role_permissions().get(role, set()))
 
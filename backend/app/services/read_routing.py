@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import logging
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from app.core.settings import settings
+from app.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Value: epoch ms until which the user's reads go to the primary (shared by all workers).
+_PREFIX = "ryw:user:"
+
+# User of the request being handled; copied into threadpool calls with the context.
+_request_user: ContextVar[str | None] = ContextVar("request_user", default=None)
+
+
+def set_request_user(user_id: str) -> None:
+    _request_user.set(user_id)
+
+
+def note_write(user_id: str) -> None:
+    window = settings.db_read_your_writes_ms
+    try:
+        get_redis().set(_PREFIX + user_id, int(time.time() * 1000) + window, px=window)
+    except Exception:
+        logger.exception("Failed to record write for read-your-writes")
+
+
+def wrote_recently(user_id: str) -> bool:
+    try:
+        until = get_redis().get(_PREFIX + user_id)
+    except Exception:
+        # Unknown: the primary is always consistent.
+        return True
+    return until is not None and int(until) > time.time() * 1000
+
+
+def _flushed(session: Session, flush_context) -> None:
+    session.info["wrote"] = True
+
+
+def _executed(state: ORMExecuteState) -> None:
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+def _committed(session: Session) -> None:
+    # get_auth_context sets the request's user.
+    user_id = _request_user.get()
+    if session.info.pop("wrote", False) and user_id:
+        note_write(user_id)
+
+
+def _rolled_back(session: Session) -> None:
+    session.info.pop("wrote", None)
+
+
+if settings.database_replica_urls:
+    event.listen(Session, "after_flush", _flushed)
+    event.listen(Session, "do_orm_execute", _executed)
+    event.listen(Session, "after_commit", _committed)
+    event.listen(Session, "after_rollback", _rolled_back)
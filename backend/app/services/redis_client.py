@@ -26,11 +26,26 @@ class MockRedis:
         self._data = {}
         
     def set(self, key, value, ex=None, px=None, nx=False, xx=False):
+        if (nx and key in self._data) or (xx and key not in self._data):
+            return None
         self._data[key] = value
         return True
         
     def get(self, key):
         return self._data.get(key)
+
+    def mget(self, *keys):
+        if len(keys) == 1 and isinstance(keys[0], (list, tuple)):
+            keys = keys[0]
+        return [self._data.get(k) for k in keys]
+
+    def incr(self, key, amount=1):
+        self._data[key] = int(self._data.get(key, 0)) + amount
+        return self._data[key]
+
+    def expire(self, key, seconds):
+        # No TTL support in the mock; keys live for the process lifetime.
+        return key in self._data
         
     def delete(self, *keys):
         count = 0
@@ -80,3 +95,8 @@ def get_redis() -> "Redis":
             _redis_client = MockRedis()
             
     return _redis_client or MockRedis()
+
+
+def redis_is_shared() -> bool:
+    """False on the in-memory fallback, whose keys (and counters) are private to each worker."""
+    return not isinstance(get_redis(), MockRedis)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.driver import DriverProfile
+from app.models.geozone import Geozone
+from app.models.vehicle import Vehicle
+from app.services.cache import tenant_cache
+
+_ZONE_COLUMNS = (Geozone.id, Geozone.zone_type, Geozone.center_lat, Geozone.center_lon, Geozone.radius_m, Geozone.polygon)
+
+
+def active_geozones(db: Session, company_id: str) -> list[dict[str, Any]]:
+    """Shapes of the company's active geozones (read on every telemetry batch)."""
+
+    def load() -> list[dict[str, Any]]:
+        rows = db.execute(select(*_ZONE_COLUMNS).where(Geozone.company_id == company_id, Geozone.is_active.is_(True)))
+        return [{**row._asdict(), "zone_type": row.zone_type.value} for row in rows]
+
+    return tenant_cache.get_or_load(company_id, "geozones", "active", load)
+
+
+def driver_vehicle_ids(db: Session, company_id: str, user_id: str) -> list[str]:
+    """Vehicles assigned to the driver profile of the user; empty without a profile."""
+
+    def load() -> list[str]:
+        stmt = (
+            select(Vehicle.id)
+            .join(DriverProfile, Vehicle.driver_profile_id == DriverProfile.id)
+            .where(DriverProfile.user_id == user_id, DriverProfile.company_id == company_id, Vehicle.company_id == company_id)
+        )
+        return list(db.execute(stmt).scalars())
+
+    return tenant_cache.get_or_load(company_id, "driver_profiles", f"vehicles:{user_id}", load)
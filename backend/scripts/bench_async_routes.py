@@ -0,0 +1,169 @@
+"""Throughput of the hot (async) routes under many concurrent clients.
+
+Start the API and run the script against it:
+
+    uvicorn app.main:app --workers 4 --port 8000
+
+    python scripts/bench_async_routes.py --email owner@example.com --password owner123 --vehicle-id <id>
+
+Every client keeps one HTTP/1.1 connection open and loops over the selected endpoints for
+`--duration` seconds. Sync handlers are capped by the threadpool (40 threads per worker) and
+queue behind it; async handlers wait on the connection pool instead. The script reports
+requests/s, errors and latency percentiles per endpoint.
+
+Each route has a single handler in this build, so the script has no sync baseline of its own:
+it measures the build it is pointed at. To compare, run it with the same workers and database
+against a build from before the async routes. The telemetry ingest handler is async but runs
+its batch on the threadpool, so it stays bounded by the pool like a sync handler.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+import urllib.request
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+
+def _request(method: str, url: str, body: dict | None = None, headers: dict | None = None) -> dict:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json", **(headers or {})})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read() or b"{}")
+
+
+def _pct(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+class _Connection:
+    """Minimal keep-alive HTTP/1.1 client (no extra dependency, one request in flight)."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self.reader: asyncio.StreamReader | None = None
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def request(self, method: str, path: str, headers: dict[str, str], body: bytes = b"") -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Length: {len(body)}\r\n"
+        head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        self.writer.write(head.encode("latin-1") + b"\r\n" + body)
+        await self.writer.drain()
+
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        chunked = False
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            name = name.strip().lower()
+            if name == "content-length":
+                length = int(value)
+            elif name == "transfer-encoding" and "chunked" in value.lower():
+                chunked = True
+        if chunked:
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif length:
+            await self.reader.readexactly(length)
+        return status
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def _client(
+    host: str,
+    port: int,
+    calls: list[tuple[str, str, str, dict[str, str], bytes]],
+    deadline: float,
+    offset: int,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    conn = _Connection(host, port)
+    i = offset
+    try:
+        while time.perf_counter() < deadline:
+            name, method, path, headers, body = calls[i % len(calls)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                status = await conn.request(method, path, headers, body)
+            except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+                conn.close()
+                errors[name] += 1
+                continue
+            if status >= 400:
+                errors[name] += 1
+            else:
+                latencies[name].append((time.perf_counter() - started) * 1000)
+    finally:
+        conn.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base", default="http://localhost:8000/api/v1")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--vehicle-id", help="enables the telemetry ingest endpoint")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    args = parser.parse_args()
+
+    token = _request("POST", f"{args.base}/auth/login", {"email": args.email, "password": args.password})["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+    url = urlsplit(args.base)
+    prefix = url.path.rstrip("/")
+
+    calls = [
+        ("vehicles", "GET", f"{prefix}/vehicles", auth, b""),
+        ("notifications", "GET", f"{prefix}/notifications", auth, b""),
+        ("audit", "GET", f"{prefix}/audit?limit=50", auth, b""),
+    ]
+    if args.vehicle_id:
+        api_key = _request(
+            "POST", f"{args.base}/telemetry/api-keys", {"name": "bench", "rate_limit_per_min": 10_000_000}, auth
+        )["api_key"]
+        body = json.dumps({"updates": [{"vehicle_id": args.vehicle_id, "fuel_pct": 50.0}]}).encode("utf-8")
+        headers = {"X-API-Key": api_key, "Content-Type": "application/json"}
+        calls.append(("telemetry.ingest", "POST", f"{prefix}/telemetry/ingest", headers, body))
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(
+        *(
+            _client(url.hostname or "localhost", url.port or 80, calls, deadline, i, latencies, errors)
+            for i in range(args.clients)
+        )
+    )
+
+    print(f"clients={args.clients} duration={args.duration:.0f}s")
+    for name, *_ in calls:
+        values = latencies[name]
+        print(
+            f"{name:<18} rps={len(values) / args.duration:8.1f} errors={errors[name]:<6} "
+            f"p50={_pct(values, 0.50):.1f} p95={_pct(values, 0.95):.1f} p99={_pct(values, 0.99):.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,326 @@
+"""In-process benchmark of list endpoint serialization.
+
+Run from backend/:
+
+    python scripts/bench_list_serialization.py --rows 1000 --repeat 50
+
+Seeds a throwaway SQLite database with N rows for every list endpoint served through
+app.api.v1.fields (vehicles, half with a driver, orders, alerts, users, geozones, geozone
+events, incidents, notifications and telemetry API keys) and measures ms per page for
+  - the ORM path the list routes used before: entities -> response_model validation ->
+    jsonable dump -> json.dumps (what FastAPI does for a returned list),
+  - the projection path (app.api.v1.fields): column rows -> dicts -> orjson,
+  - the projection path with the debug-mode schema check on.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+_DB_PATH = Path(tempfile.mkdtemp()) / "bench.db"
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import JSON, insert  # noqa: E402
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+
+from app.api.v1.fields import Embedded, Projection  # noqa: E402
+from app.core.serialization import dumps_bytes  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models.alert import Alert  # noqa: E402
+from app.models.company import Company  # noqa: E402
+from app.models.driver import DriverProfile  # noqa: E402
+from app.models.enums import (  # noqa: E402
+    AlertStatus,
+    GeozoneEventType,
+    GeozoneType,
+    IncidentSeverity,
+    IncidentStatus,
+    NotificationLevel,
+    OrderStatus,
+    UserRole,
+)
+from app.models.geozone import Geozone, GeozoneEvent  # noqa: E402
+from app.models.incident import Incident  # noqa: E402
+from app.models.notification import Notification  # noqa: E402
+from app.models.order import Order  # noqa: E402
+from app.models.telemetry import TelemetryApiKey  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.vehicle import Vehicle  # noqa: E402
+from app.schemas.alert import AlertOut  # noqa: E402
+from app.schemas.geozone import GeozoneEventOut, GeozoneOut  # noqa: E402
+from app.schemas.incident import IncidentOut  # noqa: E402
+from app.schemas.notification import NotificationOut  # noqa: E402
+from app.schemas.order import OrderOut  # noqa: E402
+from app.schemas.telemetry import TelemetryApiKeyOut  # noqa: E402
+from app.schemas.user import UserOut  # noqa: E402
+from app.schemas.vehicle import DriverProfileEmbedded, VehicleOut  # noqa: E402
+
+
+# Postgres-only column types, stored as JSON in the SQLite stand-in.
+@compiles(JSONB, "sqlite")
+@compiles(ARRAY, "sqlite")
+def _as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+Vehicle.__table__.c.status_secondary.type = JSON()
+Geozone.__table__.c.polygon.type = JSON()
+
+
+_POLYGON = {"type": "Polygon", "coordinates": [[[37.5, 55.7], [37.5, 55.8], [37.7, 55.8], [37.7, 55.7], [37.5, 55.7]]]}
+
+
+def _seed(rows: int) -> str:
+    Base.metadata.create_all(engine)
+    company_id = str(uuid.uuid4())
+    user_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(Company), [{"id": company_id, "name": "Bench", "slug": "bench"}])
+        conn.execute(
+            insert(User),
+            [{"id": user_id, "company_id": company_id, "email": "bench@example.com", "password_hash": "-", "role": UserRole.owner}]
+            + [
+                {
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    "email": f"driver{i}@example.com",
+                    "password_hash": "-",
+                    "role": UserRole.driver,
+                    "created_at": now - timedelta(minutes=i),
+                }
+                for i in range(rows - 1)
+            ],
+        )
+        drivers = [
+            {"id": str(uuid.uuid4()), "company_id": company_id, "name": f"Driver {i}", "phone": f"+7900{i:07d}"}
+            for i in range(max(1, rows // 10))
+        ]
+        conn.execute(insert(DriverProfile), drivers)
+        vehicles = [
+            {
+                "id": str(uuid.uuid4()),
+                "company_id": company_id,
+                "name": f"Truck {i}",
+                "plate": f"A{i:06d}",
+                "vin": f"VIN{i:014d}",
+                "status_main": "on_route",
+                "status_secondary": ["loaded", "night"],
+                "origin": "Moscow",
+                "destination": "Kazan",
+                "load_pct": 72.5,
+                "fuel_pct": 41.0,
+                "last_lat": 55.75 + i / 1e4,
+                "last_lon": 37.61 + i / 1e4,
+                "driver_profile_id": drivers[i % len(drivers)]["id"] if i % 2 else None,
+                "telemetry_updated_at": now - timedelta(seconds=i),
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ]
+        conn.execute(insert(Vehicle), vehicles)
+        conn.execute(
+            insert(Order),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    "title": f"Order {i}",
+                    "cargo_desc": "Pallets",
+                    "origin": "Moscow",
+                    "destination": "Kazan",
+                    "vehicle_id": vehicles[i]["id"],
+                    "created_by_user_id": user_id,
+                    "status": OrderStatus.new,
+                    "created_at": now - timedelta(minutes=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        conn.execute(
+            insert(Alert),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    "vehicle_id": vehicles[i]["id"],
+                    "created_by_user_id": user_id,
+                    "alert_type": "geofence",
+                    "message": f"Left the route, km {i}",
+                    "status": AlertStatus.created,
+                    "created_at": now - timedelta(minutes=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        geozones = [
+            {
+                "id": str(uuid.uuid4()),
+                "company_id": company_id,
+                "name": f"Zone {i}",
+                "zone_type": GeozoneType.polygon if i % 2 else GeozoneType.circle,
+                "is_active": True,
+                "center_lat": None if i % 2 else 55.75,
+                "center_lon": None if i % 2 else 37.61,
+                "radius_m": None if i % 2 else 500.0,
+                "polygon": _POLYGON if i % 2 else None,
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ]
+        conn.execute(insert(Geozone), geozones)
+        conn.execute(
+            insert(GeozoneEvent),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    "vehicle_id": vehicles[i]["id"],
+                    "geozone_id": geozones[i]["id"],
+                    "event_type": GeozoneEventType.enter if i % 2 else GeozoneEventType.exit,
+                    "lat": 55.75,
+                    "lon": 37.61,
+                    "occurred_at": now - timedelta(seconds=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        conn.execute(
+            insert(Incident),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    "title": f"Incident {i}",
+                    "description": "Cargo seal broken at the unloading dock",
+                    "severity": IncidentSeverity.high,
+                    "status": IncidentStatus.open,
+                    "related_entity_type": "vehicle",
+                    "related_entity_id": vehicles[i]["id"],
+                    "created_by_user_id": user_id,
+                    "sla_due_at": now + timedelta(hours=4),
+                    "created_at": now - timedelta(minutes=i),
+                    "updated_at": now - timedelta(minutes=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        conn.execute(
+            insert(Notification),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    "user_id": user_id,
+                    "level": NotificationLevel.warning,
+                    "title": f"Alert on Truck {i}",
+                    "detail": "Left the route",
+                    "created_at": now - timedelta(minutes=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        conn.execute(
+            insert(TelemetryApiKey),
+            [
+                {
+                    "id": str(uuid.uuid4()),
+                    "company_id": company_id,
+                    "name": f"Tracker {i}",
+                    "key_hash": f"{i:064x}",
+                    "is_active": True,
+                    "rate_limit_per_min": 120,
+                    "last_used_at": now - timedelta(seconds=i),
+                    "created_at": now - timedelta(minutes=i),
+                }
+                for i in range(rows)
+            ],
+        )
+    return company_id
+
+
+def _orm_page(db, projection: Projection, schema, company_id: str, limit: int) -> bytes:
+    model = projection.model
+    order = getattr(model, projection.order_by)
+    entities = db.query(model).filter(model.company_id == company_id).order_by(order.desc(), model.id.desc()).limit(limit).all()
+    adapter = TypeAdapter(list[schema])
+    items = adapter.dump_python(adapter.validate_python(entities, from_attributes=True), mode="json")
+    return json.dumps(items, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _projection_page(db, projection: Projection, company_id: str, limit: int, validate: bool) -> bytes:
+    model = projection.model
+    order = getattr(model, projection.order_by)
+    stmt = projection.statement().where(model.company_id == company_id)
+    rows = db.execute(stmt.order_by(order.desc(), model.id.desc()).limit(limit)).all()
+    items = projection.rows(rows, projection.all_fields)
+    if validate:
+        projection.adapter(projection.all_fields).validate_python(items)
+    return dumps_bytes(items)
+
+
+def _measure(fn, repeat: int) -> tuple[float, int]:
+    size = len(fn())  # warm-up (statement cache, adapters)
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000, help="rows per page (and seeded per model)")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    company_id = _seed(args.rows)
+    # Same projections as the routes (app.api.v1.routes.*).
+    endpoints = [
+        (
+            "vehicles",
+            VehicleOut,
+            Projection(
+                Vehicle,
+                VehicleOut,
+                embedded={"driver": Embedded(DriverProfile, Vehicle.driver_profile_id == DriverProfile.id, DriverProfileEmbedded)},
+            ),
+        ),
+        ("orders", OrderOut, Projection(Order, OrderOut)),
+        ("alerts", AlertOut, Projection(Alert, AlertOut)),
+        ("users", UserOut, Projection(User, UserOut)),
+        ("geozones", GeozoneOut, Projection(Geozone, GeozoneOut)),
+        ("geo-events", GeozoneEventOut, Projection(GeozoneEvent, GeozoneEventOut, order_by="occurred_at")),
+        ("incidents", IncidentOut, Projection(Incident, IncidentOut)),
+        ("notifs", NotificationOut, Projection(Notification, NotificationOut)),
+        ("api-keys", TelemetryApiKeyOut, Projection(TelemetryApiKey, TelemetryApiKeyOut)),
+    ]
+
+    print(f"rows/page={args.rows} repeat={args.repeat} (median ms per page)")
+    print(f"{'endpoint':<10} {'orm':>9} {'fast':>9} {'fast+chk':>9} {'speedup':>8} {'bytes':>9}")
+    with SessionLocal() as db:
+        for name, schema, projection in endpoints:
+            orm_ms, size = _measure(lambda: _orm_page(db, projection, schema, company_id, args.rows), args.repeat)
+            db.expunge_all()
+            fast_ms, _ = _measure(lambda: _projection_page(db, projection, company_id, args.rows, False), args.repeat)
+            checked_ms, _ = _measure(lambda: _projection_page(db, projection, company_id, args.rows, True), args.repeat)
+            print(f"{name:<10} {orm_ms:9.2f} {fast_ms:9.2f} {checked_ms:9.2f} {orm_ms / fast_ms:7.1f}x {size:9d}")
+
+
+if __name__ == "__main__":
+    main()
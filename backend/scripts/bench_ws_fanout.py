@@ -0,0 +1,80 @@
+"""In-process benchmark of WebSocket fan-out throughput.
+
+Run from backend/:
+
+    python scripts/bench_ws_fanout.py --connections 1000 --events 200
+
+Publishes events to one company with N subscribed connections and measures deliveries/s for
+  - per-subscriber encoding (the old `ws.send_json(event)` path),
+  - the pre-encoded frame carried by the bus (`ws.send_text(event.frame)`).
+Sockets are stubs that only account for the bytes sent, so the numbers isolate bus + encoding cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "bench")
+
+from app.services.events import InMemoryEventBus  # noqa: E402
+
+
+class _StubSocket:
+    def __init__(self) -> None:
+        self.bytes_sent = 0
+
+    async def send_text(self, data: str) -> None:
+        self.bytes_sent += len(data)
+
+    async def send_json(self, data: dict) -> None:
+        # Same encoding Starlette's WebSocket.send_json performs.
+        await self.send_text(json.dumps(data, separators=(",", ":"), ensure_ascii=False))
+
+
+async def _consume(q: asyncio.Queue, ws: _StubSocket, expected: int, encode_once: bool) -> None:
+    for _ in range(expected):
+        event = await q.get()
+        if encode_once:
+            await ws.send_text(event.frame)
+        else:
+            await ws.send_json(event.data)
+
+
+async def _run(connections: int, events: int, encode_once: bool) -> float:
+    bus = InMemoryEventBus()
+    sockets = [_StubSocket() for _ in range(connections)]
+    queues = [await bus.subscribe("bench") for _ in sockets]
+    consumers = [asyncio.create_task(_consume(q, ws, events, encode_once)) for q, ws in zip(queues, sockets)]
+    payload = {"type": "telemetry.ingested", "updated": 120, "positions": 118, "geozone_events": 3, "at": "2026-01-01T00:00:00+00:00"}
+
+    started = time.perf_counter()
+    for i in range(events):
+        await bus.publish("bench", {**payload, "n": i})
+        # Let consumers drain so queues never hit the drop-oldest path.
+        await asyncio.sleep(0)
+    await asyncio.gather(*consumers)
+    elapsed = time.perf_counter() - started
+    return connections * events / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=200)
+    args = parser.parse_args()
+
+    for label, encode_once in (("send_json per subscriber", False), ("encode once at publish", True)):
+        rate = await _run(args.connections, args.events, encode_once)
+        print(f"{label:<26} {rate:>12,.0f} deliveries/s  ({args.connections} connections x {args.events} events)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
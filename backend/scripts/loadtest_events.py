@@ -0,0 +1,114 @@
+"""End-to-end realtime event latency across API workers.
+
+Start the API with several workers and the Redis bus, e.g.:
+
+    EVENT_BUS_BACKEND=redis uvicorn app.main:app --workers 4 --port 8000
+
+then run (needs the `websockets` package, installed with uvicorn[standard]):
+
+    python scripts/loadtest_events.py --email owner@example.com --password owner123 --vehicle-id <id>
+
+Each ingest call publishes one `telemetry.ingested` event stamped with the server time (`at`).
+Every WebSocket client should receive every event regardless of the worker it landed on; the
+script reports delivery ratio and latency percentiles (publish `at` -> client receive).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import urllib.request
+from datetime import datetime
+
+import websockets
+
+
+def _request(method: str, url: str, body: dict | None = None, headers: dict | None = None) -> dict:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json", **(headers or {})})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read() or b"{}")
+
+
+def _pct(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def _client(ws_url: str, expected: int, latencies: list[float], received: list[int], ready: asyncio.Event, done: asyncio.Event) -> None:
+    count = 0
+    async with websockets.connect(ws_url, max_queue=None) as ws:
+        await ws.recv()  # "connected"
+        ready.set()
+        while count < expected and not done.is_set():
+            try:
+                raw = await asyncio.wait_for(ws.recv(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            now = time.time()
+            frame = json.loads(raw)
+            events = frame["events"] if frame.get("type") == "batch" else [frame]
+            for event in events:
+                if event.get("type") != "telemetry.ingested" or not event.get("at"):
+                    continue
+                latencies.append((now - datetime.fromisoformat(event["at"]).timestamp()) * 1000)
+                count += 1
+    received.append(count)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base", default="http://localhost:8000/api/v1")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--vehicle-id", required=True)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=50.0, help="ingest calls per second")
+    args = parser.parse_args()
+
+    token = _request("POST", f"{args.base}/auth/login", {"email": args.email, "password": args.password})["access_token"]
+    auth = {"Authorization": f"Bearer {token}"}
+    api_key = _request(
+        "POST", f"{args.base}/telemetry/api-keys", {"name": "loadtest", "rate_limit_per_min": 1_000_000}, auth
+    )["api_key"]
+
+    # Coalescing would merge telemetry.ingested summaries; measure raw per-event delivery.
+    ws_url = args.base.replace("http", "ws", 1) + f"/ws?coalesce_ms=0&token={token}"
+    latencies: list[float] = []
+    received: list[int] = []
+    done = asyncio.Event()
+    readies = [asyncio.Event() for _ in range(args.clients)]
+    tasks = [asyncio.create_task(_client(ws_url, args.events, latencies, received, r, done)) for r in readies]
+    await asyncio.gather(*(r.wait() for r in readies))
+
+    loop = asyncio.get_running_loop()
+    body = {"updates": [{"vehicle_id": args.vehicle_id, "fuel_pct": 50.0}]}
+    started = time.perf_counter()
+    for i in range(args.events):
+        await loop.run_in_executor(None, _request, "POST", f"{args.base}/telemetry/ingest", body, {"X-API-Key": api_key})
+        await asyncio.sleep(max(0.0, started + (i + 1) / args.rate - time.perf_counter()))
+
+    try:
+        await asyncio.wait_for(asyncio.gather(*tasks), timeout=10)
+    except asyncio.TimeoutError:
+        done.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    total = args.clients * args.events
+    print(f"clients={args.clients} events={args.events} delivered={sum(received)}/{total} ({100 * sum(received) / total:.1f}%)")
+    if latencies:
+        print(
+            "latency ms: "
+            f"p50={_pct(latencies, 0.50):.1f} p95={_pct(latencies, 0.95):.1f} "
+            f"p99={_pct(latencies, 0.99):.1f} max={max(latencies):.1f} mean={statistics.fmean(latencies):.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+# Settings and engines are built at import: point them at a throwaway SQLite file first.
+os.environ["DATABASE_URL"] = f"sqlite:///{Path(tempfile.mkdtemp()) / 'test.db'}"
+os.environ.setdefault("JWT_SECRET", "test-secret-" + "x" * 32)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import JSON  # noqa: E402
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+
+from app.db.base import Base  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.models.vehicle import Vehicle  # noqa: E402
+
+
+# Postgres-only column types, stored as JSON in the SQLite stand-in.
+@compiles(JSONB, "sqlite")
+@compiles(ARRAY, "sqlite")
+def _as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+Vehicle.__table__.c.status_secondary.type = JSON()
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+
+    Base.metadata.create_all(engine)
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client) -> dict[str, str]:
+    credentials = {"email": "owner@example.com", "password": "pw123456"}
+    r = client.post("/api/v1/auth/register", json={**credentials, "company_slug": "test-co"})
+    assert r.status_code == 200, r.text
+    r = client.post("/api/v1/auth/login", json=credentials)
+    assert r.status_code == 200, r.text
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
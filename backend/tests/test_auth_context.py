@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app.db.session import async_engine, engine
+
+_USERS_SELECT = re.compile(r"^\s*SELECT\b.*\bFROM users\b", re.IGNORECASE | re.DOTALL)
+
+
+@pytest.fixture
+def user_selects():
+    statements: list[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if _USERS_SELECT.match(statement):
+            statements.append(statement)
+
+    # The user lookup runs on the async engine, route queries on either.
+    engines = (engine, async_engine.sync_engine)
+    for e in engines:
+        event.listen(e, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for e in engines:
+            event.remove(e, "before_cursor_execute", record)
+
+
+# Each route stacks several auth dependencies (permission check, current user, read session).
+@pytest.mark.parametrize("path", ["/api/v1/alerts", "/api/v1/vehicles", "/api/v1/orders", "/api/v1/notifications", "/api/v1/auth/me"])
+def test_one_user_lookup_per_request(client, auth_headers, user_selects, path):
+    for _ in range(2):
+        user_selects.clear()
+        r = client.get(path, headers=auth_headers)
+        assert r.status_code == 200, r.text
+        assert len(user_selects) == 1, user_selects
@@ -1898,7 +1898,7 @@ async function loadData() {
   try {
     // Try to load from API first
     if (authToken) {
-      const apiVehicles = await apiRequest("/vehicles");
+      const apiVehicles = await routoxApiRequestAll("/vehicles", authToken);
       vehicles = (apiVehicles || []).map(v => ({
         ...v,
         status: v.status_main || "В пути",
@@ -1941,7 +1941,7 @@ async function loadData() {
       })).map(enrichVehicle);
       
       // Load drivers from local data (API doesn't have drivers endpoint yet)
-      const res = await fetch("./assets/data/data.json", { cache: "no-cache" });
+      const res = await fetch("./assets/data/data.json");
       if (res.ok) {
         const json = await res.json();
         drivers = (json.drivers || []).map(enrichDriver);
@@ -1952,7 +1952,7 @@ async function loadData() {
       }
     } else {
       // Fallback to local data if no auth token
-      const res = await fetch("./assets/data/data.json", { cache: "no-cache" });
+      const res = await fetch("./assets/data/data.json");
       if (!res.ok) throw new Error("data.json not found");
       const json = await res.json();
       vehicles = (json.vehicles || []).map(enrichVehicle);
@@ -2218,7 +2218,7 @@ function bindUI() {
       return;
     }
     try {
-      const orders = await apiRequest("/orders");
+      const orders = await routoxApiRequestAll("/orders", authToken);
       renderAdminOrders(orders);
     } catch (err) {
       adminOrdersEmpty.textContent = "Не удалось загрузить заказы";
@@ -18,7 +18,7 @@ function routoxClearToken() {
   }
 }
 
-async function routoxApiRequest(endpoint, token, options = {}) {
+async function routoxFetch(endpoint, token, options = {}) {
   const url = `${ROUTOX_API_BASE_URL}${endpoint}`;
   const headers = {
     "Content-Type": "application/json",
@@ -44,9 +44,27 @@ async function routoxApiRequest(endpoint, token, options = {}) {
     e.status = res.status;
     throw e;
   }
+  return res;
+}
+
+async function routoxApiRequest(endpoint, token, options = {}) {
+  const res = await routoxFetch(endpoint, token, options);
   return await res.json();
 }
 
+// List endpoints return pages; follow X-Next-Cursor until the last one.
+async function routoxApiRequestAll(endpoint, token) {
+  const items = [];
+  let cursor = null;
+  do {
+    const sep = endpoint.includes("?") ? "&" : "?";
+    const res = await routoxFetch(`${endpoint}${cursor ? `${sep}cursor=${encodeURIComponent(cursor)}` : ""}`, token);
+    items.push(...(await res.json()));
+    cursor = res.headers.get("X-Next-Cursor");
+  } while (cursor);
+  return items;
+}
+
 async function routoxFetchMe(token) {
   // Check if demo token (for local mode without backend)
   if (token && token.startsWith("demo_")) {
@@ -276,6 +294,7 @@ async function routoxRequireAuth({ allowRoles = null } = {}) {
 
 window.RoutoxCommon = {
   apiRequest: routoxApiRequest,
+  apiRequestAll: routoxApiRequestAll,
   fetchMe: routoxFetchMe,
   getToken: routoxGetToken,
   clearToken: routoxClearToken,
@@ -1,3 +1,4 @@
+// Needs common.js (routoxApiRequestAll) loaded first.
 // Use relative URL when running through nginx on port 8080
 const API_BASE_URL = window.location.port === "8080" ? "/api/v1" : "http://localhost:8000/api/v1";
 const SETTINGS_KEY = "routox-settings";
@@ -339,7 +340,7 @@ async function refreshOrders(token) {
   }
 
   try {
-    const orders = await apiRequest("/orders", token);
+    const orders = await routoxApiRequestAll("/orders", token);
     renderOrders(orders, token);
   } catch {
     if (empty) {
@@ -362,7 +363,7 @@ async function refreshAlerts(token) {
   }
 
   try {
-    const alerts = await apiRequest("/alerts/active", token);
+    const alerts = await routoxApiRequestAll("/alerts/active", token);
     renderAlerts(alerts, token);
   } catch (e) {
     if (empty) {
@@ -1,3 +1,4 @@
+// Needs common.js (routoxApiRequestAll) loaded first.
 // Use relative URL when running through nginx on port 8080
 const API_BASE_URL = window.location.port === "8080" ? "/api/v1" : "http://localhost:8000/api/v1";
 
@@ -256,7 +257,7 @@ async function refreshUsers(token) {
     return;
   }
   try {
-    const users = await apiRequest("/users", token);
+    const users = await routoxApiRequestAll("/users", token);
     renderUsers(users, token);
   } catch (e) {
     if (empty) {
@@ -318,7 +319,7 @@ async function refreshOrders(token) {
     return;
   }
   try {
-    const orders = await apiRequest("/orders", token);
+    const orders = await routoxApiRequestAll("/orders", token);
     renderOrders(orders);
   } catch (e) {
     if (empty) {